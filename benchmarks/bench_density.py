@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Session Density Benchmark
+Compare the default and dense launch profiles at several concurrency levels:
+resident memory per browser session and flash-flow latency on local fixtures.
+
+Usage:
+    python benchmarks/bench_density.py --sessions 1 4 16
+    python benchmarks/bench_density.py --block "*.png" "*.jpg"   # dense + URL blocking
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+from fixture_server import serve_fixtures
+
+
+def process_tree_rss_kb(root_pid):
+    """Sum the resident set size of a process and all of its descendants (KiB)."""
+    output = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,rss='], capture_output=True, text=True).stdout
+    children, rss = {}, {}
+    for line in output.splitlines():
+        pid, ppid, kb = (int(field) for field in line.split())
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def run_session(base_url, settings, started):
+    """Start one session, run the flash flow against fixtures, and return (buyer, latency, ok).
+
+    The buyer is added to started before its browser launches, so the caller
+    can quit it even when the launch or the flow raises.
+    """
+    buyer = AmazonAutoBuyer(settings=dict(settings, base_url=base_url, reuse_existing_browser=False))
+    started.append(buyer)
+    buyer._create_new_chrome_session()
+    start = time.perf_counter()
+    ok = (buyer.login_to_amazon() and buyer.search_product("fixture product")
+          and buyer.select_first_product() and buyer.add_to_cart(flash_sale_mode=True))
+    return buyer, time.perf_counter() - start, ok
+
+
+def measure(base_url, sessions, settings):
+    """Run N concurrent sessions and return RSS per session and flow latencies."""
+    started = []
+    try:
+        # Leaving the pool waits for every session, so a failure still lets the others register
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            runs = list(pool.map(lambda _: run_session(base_url, settings, started), range(sessions)))
+
+        rss = [process_tree_rss_kb(buyer.driver.service.process.pid) / 1024 for buyer, _, _ in runs]
+        latencies = sorted(latency for _, latency, _ in runs)
+        return {
+            'rss_mb': statistics.mean(rss),
+            'p50': statistics.median(latencies),
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'ok': sum(1 for _, _, ok in runs if ok),
+        }
+    finally:
+        for buyer in started:
+            if buyer.driver:
+                try:
+                    buyer.driver.quit()
+                except Exception as e:
+                    print(f"⚠️ Could not quit a session: {e}")
+
+
+def main():
+    """Print RSS per session and flow latency for each profile and concurrency level."""
+    parser = argparse.ArgumentParser(description="Benchmark launch profiles for session density")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--profiles', nargs='+', default=['default', 'dense'])
+    parser.add_argument('--block', nargs='*', default=[],
+                        help="URL patterns to block in the dense profile (also disables images)")
+    parser.add_argument('--headed-default', action='store_true',
+                        help="Run the default profile headed, as it is used interactively")
+    args = parser.parse_args()
+
+    server, base_url = serve_fixtures()
+    print(f"Fixture pages at {base_url}")
+    print(f"{'profile':>8} {'sessions':>8} {'RSS/session MB':>15} {'flow p50 s':>11} {'flow p95 s':>11} {'ok':>4}")
+    try:
+        for profile in args.profiles:
+            # Concurrent sessions cannot share a persistent profile (Chrome locks its user data dir)
+            settings = {'launch_profile': profile, 'headless': not args.headed_default, 'browser_profile': None}
+            if profile == 'dense':
+                settings['block_url_patterns'] = args.block
+            for sessions in args.sessions:
+                result = measure(base_url, sessions, settings)
+                print(f"{profile:>8} {sessions:>8} {result['rss_mb']:>15.1f} {result['p50']:>11.3f} "
+                      f"{result['p95']:>11.3f} {result['ok']:>4}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Search Mode Benchmark
+Compare time-to-product-page for the rendered search path (search_product +
+select_first_product) and the render-free path (in-page fetch + DOMParser,
+then one navigation) against the local fixture pages.
+
+The fixture search page starts with a sponsored tile. The render-free path
+skips it for the first organic result, while the rendered path clicks it. The
+"landed" column shows which product each mode ended on.
+
+Usage:
+    python benchmarks/bench_search_modes.py --runs 10
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import statistics
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+from command_trace import TraceRecorder
+from fixture_server import serve_fixtures
+
+
+def rendered_path(buyer, product_name):
+    return buyer.search_product(product_name) and buyer.select_first_product()
+
+
+def fetch_path(buyer, product_name):
+    return buyer.search_and_open_product(product_name)
+
+
+def main():
+    """Time both search modes from the home page to a loaded product page."""
+    parser = argparse.ArgumentParser(description="Benchmark rendered vs render-free search")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--base-url', help="Benchmark against this site instead of the local fixtures")
+    parser.add_argument('--headed', action='store_true')
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = serve_fixtures()
+
+    buyer = AmazonAutoBuyer(settings={
+        'base_url': base_url, 'reuse_existing_browser': False, 'headless': not args.headed,
+        # A throwaway profile: a primed cache would skew the numbers, and the real one may be in use
+        'browser_profile': None,
+    })
+    buyer._create_new_chrome_session()
+    trace_path = os.path.join(tempfile.mkdtemp(), 'bench_search.jsonl')
+    recorder = TraceRecorder.attach(buyer.driver, trace_path, snapshot_dom=False)
+
+    try:
+        print(f"Benchmarking against {base_url} ({args.runs} runs per mode)")
+        print(f"{'mode':>10} {'p50 s':>8} {'p95 s':>8} {'commands':>9} {'ok':>4}  landed")
+        for name, flow in (('rendered', rendered_path), ('fetch', fetch_path)):
+            times, commands, succeeded = [], [], 0
+            for _ in range(args.runs):
+                buyer.driver.get(base_url)
+                start_seq = recorder.seq
+                start = time.perf_counter()
+                if flow(buyer, "fixture product"):
+                    succeeded += 1
+                times.append(time.perf_counter() - start)
+                commands.append(recorder.seq - start_seq)
+            landed = (buyer.current_product() or {}).get('asin', '-')
+            times.sort()
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            print(f"{name:>10} {statistics.median(times):>8.3f} {p95:>8.3f} "
+                  f"{statistics.median(commands):>9.0f} {succeeded:>4}  {landed}")
+    finally:
+        recorder.close()
+        buyer.driver.quit()
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Track CLI startup cost: import time (-X importtime) and process start to first
+WebDriver command, compared against a saved baseline.
+
+The probe really sets up the driver. It attaches to the debug Chrome when the
+config asks for reuse and one is running, and launches Chrome otherwise. So
+Chrome must be installed, and the import total includes the Selenium modules
+loaded on the way to the first command.
+
+Usage:
+    python benchmarks/bench_startup.py                    # compare with baseline
+    python benchmarks/bench_startup.py --update-baseline  # record a new baseline
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CLI = os.path.join(ROOT, 'buy.py')
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'results', 'startup_baseline.json')
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure_first_command(runs):
+    """Median wall time from process spawn to the return of the first WebDriver command, in seconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run(
+            [sys.executable, CLI, 'benchmark target', '--startup-probe'],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        probe = re.search(r'STARTUP_PROBE (\d+\.\d+)', output)
+        samples.append(float(probe.group(1)) - start)
+    return statistics.median(samples)
+
+
+def measure_imports():
+    """Run the CLI under -X importtime and return (total_us, top-level imports by cost)."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', CLI, 'benchmark target', '--startup-probe'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+
+    top_level = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return sum(top_level.values()), sorted(top_level.items(), key=lambda item: -item[1])
+
+
+def main():
+    """Measure startup, print the hot imports and check for regressions."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup")
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Allowed slowdown over baseline before failing (default 15%%)")
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    first_command = measure_first_command(args.runs)
+    import_total, imports = measure_imports()
+
+    print(f"Process start -> first command: {first_command * 1000:.1f} ms (median of {args.runs})")
+    print(f"Total import time:              {import_total / 1000:.1f} ms")
+    print("Slowest top-level imports:")
+    for name, micros in imports[:8]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    current = {'first_command_ms': round(first_command * 1000, 1), 'import_ms': round(import_total / 1000, 1)}
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baseline yet; run with --update-baseline to record one")
+        return 0
+
+    with open(BASELINE_PATH, 'r') as f:
+        baseline = json.load(f)
+    regressed = False
+    for key, value in current.items():
+        limit = baseline[key] * (1 + args.tolerance)
+        flag = "REGRESSION" if value > limit else "ok"
+        regressed = regressed or value > limit
+        print(f"{key}: {value} (baseline {baseline[key]}, limit {limit:.1f}) {flag}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
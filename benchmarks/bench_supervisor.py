@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Supervisor Scaling Benchmark
+Measure how the buyer process pool scales with worker count on local fixtures.
+
+Usage:
+    python benchmarks/bench_supervisor.py --workers 1 2 4 --targets-per-worker 2
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from buyer_pool import BuyerSupervisor
+from fixture_server import serve_fixtures
+
+
+def main():
+    """Run the pool at each worker count and print throughput and phase medians."""
+    parser = argparse.ArgumentParser(description="Benchmark BuyerSupervisor scaling")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--targets-per-worker', type=int, default=2)
+    parser.add_argument('--config', default='config/config.json')
+    parser.add_argument('--headed', action='store_true', help="Show the browser windows")
+    args = parser.parse_args()
+
+    server, base_url = serve_fixtures()
+    settings = {'base_url': base_url, 'headless': not args.headed}
+    print(f"Fixture pages at {base_url}")
+    print(f"{'workers':>8} {'targets':>8} {'total s':>8} {'items/s':>8} {'startup':>8} {'flow p50':>9} {'ok':>4}")
+
+    try:
+        for workers in args.workers:
+            targets = [f"fixture product {i}" for i in range(workers * args.targets_per_worker)]
+            profile_root = os.path.join('/tmp', f"amazon-buyer-bench-{int(time.time())}")
+            report = BuyerSupervisor(targets, workers, args.config, profile_root, settings).run()
+
+            flows = [result['elapsed'] for result in report['results']] or [0.0]
+            startups = [worker['startup'] for worker in report['workers'].values()] or [0.0]
+            succeeded = sum(1 for result in report['results'] if result['success'])
+            print(f"{workers:>8} {len(targets):>8} {report['elapsed']:>8.2f} "
+                  f"{len(targets) / report['elapsed']:>8.2f} {statistics.median(startups):>8.2f} "
+                  f"{statistics.median(flows):>9.2f} {succeeded:>4}")
+            for error in report['errors']:
+                print(f"   worker {error['worker']}: {error['error']}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
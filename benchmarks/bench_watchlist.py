@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Watchlist Overlap Benchmark
+Show that the watchlist engine overlaps page loads across tabs.
+
+Every fixture response is delayed, so page loads dominate. With overlap, the
+wall time for N targets stays close to one target's time (overlap near N).
+Without overlap, it grows with N (overlap near 1). Both page load strategies
+are run so the difference is visible.
+
+Usage:
+    python benchmarks/bench_watchlist.py --targets 4 --latency 0.5
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+from watchlist import WatchlistEngine, load_watchlist
+from fixture_server import serve_fixtures
+
+
+def run_engine(base_url, strategy, count, headless):
+    """Run count targets (half by search, half by ASIN) and return wall time and results."""
+    watchlist = [
+        {'name': f"fixture product {index}"} if index % 2 else {'asin': 'B0FIXTURE01'}
+        for index in range(count)
+    ]
+    buyer = AmazonAutoBuyer(config={'watchlist': watchlist}, settings={
+        'base_url': base_url, 'reuse_existing_browser': False, 'headless': headless,
+        'page_load_strategy': strategy, 'browser_profile': None,
+    })
+    buyer._create_new_chrome_session()
+    try:
+        engine = WatchlistEngine(buyer, load_watchlist(buyer.config))
+        engine.prepare()
+        start = time.perf_counter()
+        results = engine.run()
+        return time.perf_counter() - start, results
+    finally:
+        buyer.driver.quit()
+
+
+def main():
+    """Print wall time for one and for N targets under each page load strategy."""
+    parser = argparse.ArgumentParser(description="Benchmark watchlist tab overlap")
+    parser.add_argument('--targets', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds added to every fixture response")
+    parser.add_argument('--headed', action='store_true')
+    args = parser.parse_args()
+
+    server, base_url = serve_fixtures(latency=args.latency)
+    print(f"Fixture pages at {base_url} (+{args.latency:.2f}s per response)")
+    print(f"{'strategy':>8} {'1 target s':>10} {f'{args.targets} targets s':>12} {'added':>5} {'overlap':>7}")
+    try:
+        for strategy in ('normal', 'none'):
+            single, _ = run_engine(base_url, strategy, 1, not args.headed)
+            wall, results = run_engine(base_url, strategy, args.targets, not args.headed)
+            added = sum(1 for result in results if result['status'] == 'added')
+            # 1.0 = targets ran one after another; N = all N page loads fully overlapped
+            overlap = args.targets * single / wall if wall else 0
+            print(f"{strategy:>8} {single:>10.2f} {wall:>12.2f} {added:>5} {overlap:>7.2f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
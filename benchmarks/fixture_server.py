@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Local Fixture Server
+Serve the Amazon-shaped pages in benchmarks/fixtures for offline benchmarks.
+
+Point the buyer at it with the base_url setting:
+    python benchmarks/fixture_server.py --port 8800
+    # config: "settings": {"base_url": "http://127.0.0.1:8800"}
+"""
+
+import os
+import time
+import argparse
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        # Simulated server time, so page loads take long enough to overlap
+        if self.latency:
+            time.sleep(self.latency)
+        return super().send_head()
+
+
+def serve_fixtures(port=0, latency=0.0):
+    """Start the fixture server in a background thread and return (server, base_url)."""
+    handler = partial(type('_Handler', (_QuietHandler,), {'latency': latency}), directory=FIXTURE_DIR)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve local fixture pages")
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay every response")
+    args = parser.parse_args()
+
+    server, base_url = serve_fixtures(args.port, args.latency)
+    print(f"Serving {FIXTURE_DIR} at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
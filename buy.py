@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Amazon Auto-Buyer CLI
+Non-interactive entry point: everything comes from arguments, nothing is prompted.
+
+Usage:
+    python buy.py "product name"                    # flash sale mode
+    python buy.py "product name" --mode normal      # full flow, stops at checkout
+    python buy.py "product name" --profile sale     # uses config/sale.json
+    python buy.py "product name" --mode rehearse    # dry run: resolve everything, click nothing
+
+Only the standard library is imported up front. The buyer is imported once the
+arguments and config have been validated, and Selenium's WebDriver modules only
+when the first driver is set up.
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from buyer_config import load_config
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Amazon Auto-Buyer (non-interactive)")
+    parser.add_argument('target', help="Product name to search for")
+    parser.add_argument('--mode', choices=['flash', 'normal', 'rehearse'], default='flash',
+                        help="flash: stop after add to cart (default); normal: continue to checkout; "
+                             "rehearse: dry run up to the add-to-cart click with a go/no-go report")
+    parser.add_argument('--profile', default='config',
+                        help="Config profile name, read from config/<profile>.json (default: config)")
+    parser.add_argument('--config', help="Explicit config file path (overrides --profile)")
+    parser.add_argument('--profile-python', action='store_true',
+                        help="Sample Python stacks per phase and write flamegraph data under logs/profile")
+    parser.add_argument('--startup-probe', action='store_true',
+                        help="Set up the driver, print a timestamp once the first WebDriver command "
+                             "(newSession) has returned, and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run one purchase flow from command-line arguments and return an exit code."""
+    args = parse_args(argv)
+    target = args.target.strip()
+    if not target:
+        print("No product name provided. Exiting...")
+        return 2
+
+    config_path = args.config or os.path.join('config', f"{args.profile}.json")
+    config = load_config(config_path)
+
+    # Deferred: Selenium is only worth importing once there is work to do
+    from amazon_buyer import AmazonAutoBuyer
+
+    settings = {'profile_python': True} if args.profile_python else None
+    buyer = AmazonAutoBuyer(config_path, config=config, settings=settings)
+    buyer.interactive = False
+
+    if args.startup_probe:
+        # newSession is the first WebDriver command; stamp once it has returned
+        buyer.setup_driver()
+        print(f"STARTUP_PROBE {time.time():.6f}", flush=True)
+        if buyer.launched_browser:
+            buyer.driver.quit()
+        return 0
+
+    start_time = time.time()
+    if args.mode == 'flash':
+        success = buyer.flash_sale_purchase(target)
+    elif args.mode == 'rehearse':
+        buyer.flash_sale_purchase(target, rehearse=True)
+        success = bool(buyer.rehearsal_report) and buyer.rehearsal_report['verdict'] == 'GO'
+    else:
+        success = buyer.complete_purchase(target)
+    elapsed = time.time() - start_time
+
+    phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in buyer.phase_timings.items())
+    status = "SUCCESS" if success else "FAILED"
+    if args.mode == 'rehearse':
+        report = buyer.rehearsal_report
+        status = f"{report['verdict']} (expected fire {report['expected_fire_ms']}ms)" if report else "NO REPORT"
+    print(f"{status}: {target} ({args.mode}) in {elapsed:.2f}s [{phases}]")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,9 @@
 """
 Amazon Flash Sale Auto-Buyer
 Ultra-fast version optimized for flash sales with sub-second response times.
+
+Run with --rehearse shortly before the sale to dry-run the flow (no click) and
+warm the caches the real run uses.
 """
 
 import sys
@@ -12,9 +15,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from amazon_buyer import AmazonAutoBuyer
 import logging
 
-def flash_sale_mode():
+def flash_sale_mode(rehearse=False):
     """Run the buyer in ultra-fast flash sale mode."""
-    print("🔥 FLASH SALE MODE - MAXIMUM SPEED! 🔥")
+    print("🎭 FLASH SALE REHEARSAL - NOTHING WILL BE CLICKED" if rehearse else "🔥 FLASH SALE MODE - MAXIMUM SPEED! 🔥")
     print("=" * 50)
     
     # Get product name
@@ -42,11 +45,22 @@ def flash_sale_mode():
     
     # Execute flash sale purchase
     start_time = time.time()
-    success = buyer.flash_sale_purchase(product_name)
+    success = buyer.flash_sale_purchase(product_name, rehearse=rehearse)
     elapsed = time.time() - start_time
     
     print("-" * 40)
-    if success:
+    if rehearse:
+        report = buyer.rehearsal_report
+        if report is None:
+            print(f"❌ REHEARSAL produced no report after {elapsed:.2f} seconds")
+            print("📝 Check logs/amazon_buyer.log for details")
+        else:
+            print(f"{'✅' if report['verdict'] == 'GO' else '❌'} REHEARSAL {report['verdict']} in {elapsed:.2f} seconds")
+            print(f"⚡ Expected fire latency: {report['expected_fire_ms']}ms "
+                  f"(setup and login before the sale: {report['pre_sale_ms']}ms)")
+            for check in report['checks']:
+                print(f"   {'✓' if check['ok'] else '✗'} {check['check']}: {check['detail']}")
+    elif success:
         print(f"✅ FLASH SALE SUCCESS in {elapsed:.2f} seconds! 🎉")
         print("🛒 Product added to cart!")
         print("💳 Check your cart to complete purchase manually")
@@ -57,4 +71,4 @@ def flash_sale_mode():
     print("=" * 50)
 
 if __name__ == "__main__":
-    flash_sale_mode()
\ No newline at end of file
+    flash_sale_mode(rehearse='--rehearse' in sys.argv[1:])
\ No newline at end of file
@@ -2,18 +2,52 @@
 """
 Session Preparation Script
 Pre-position browser for ultra-fast flash sale execution.
+
+Usage:
+    python prepare_session.py                 # monitor until Enter is pressed
+    python prepare_session.py --until 12:00   # stop monitoring at the sale time
 """
 
 import sys
 import os
 import time
+import argparse
+from datetime import datetime, timedelta
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from amazon_buyer import AmazonAutoBuyer
+from session_monitor import SessionMonitor
 import logging
 
-def prepare_flash_sale_session():
-    """Prepare browser session for flash sale."""
+def print_health(report):
+    """Print one live line of the session health report."""
+    parts = []
+    for metric in ('rtt', 'script', 'navigation'):
+        if metric in report:
+            stats = report[metric]
+            parts.append(f"{metric} {stats['last']:.0f} (p95 {stats['p95']:.0f}, ±{stats['jitter']:.0f})")
+    login = {True: "logged in", False: "LOGGED OUT", None: "login ?"}[report['logged_in']]
+    print(f"   🩺 {' | '.join(parts)} | {login} | tabs {report['tabs']} | alerts {report['alerts']}")
+
+def sale_time(text):
+    """Parse HH:MM[:SS] into the epoch time of its next occurrence (local time)."""
+    try:
+        parts = [int(part) for part in text.split(':')]
+        now = datetime.now()
+        target = now.replace(hour=parts[0], minute=parts[1],
+                             second=parts[2] if len(parts) > 2 else 0, microsecond=0)
+    except (ValueError, IndexError):
+        raise argparse.ArgumentTypeError(f"expected HH:MM or HH:MM:SS, got {text!r}")
+    if target <= now:
+        target += timedelta(days=1)
+    return target.timestamp()
+
+def prepare_flash_sale_session(until=None):
+    """Prepare browser session for flash sale.
+
+    The health monitor stops sampling at until (epoch seconds), and pauses on
+    its own whenever a flash sale run is using the browser.
+    """
     print("🔧 PREPARING FLASH SALE SESSION")
     print("=" * 45)
     
@@ -29,20 +63,38 @@ def prepare_flash_sale_session():
             return False
         
         print("3. 🏠 Navigating to Amazon home page...")
-        buyer.driver.get("https://www.amazon.in")
+        buyer.driver.get(buyer.base_url)
+        
+        print("4. 🛒 Pre-opening cart tab for fast checkout...")
+        buyer.prepare_cart_tab()
         
-        print("4. ✅ Session prepared successfully!")
+        print("5. ✅ Session prepared successfully!")
         print()
         print("💡 FLASH SALE TIPS:")
         print("   • Keep this browser window open")
         print("   • Have your product name ready")
-        print("   • Run './flash_sale.py' when flash sale starts")
+        print("   • Run './flash_sale.py' when flash sale starts (the health monitor pauses while it runs)")
+        if until:
+            print(f"   • Health monitor stops at {datetime.fromtimestamp(until):%H:%M:%S}")
         print("   • Expected speed: 1-3 seconds total")
         print()
         print("🚀 Ready for flash sale! Browser is standing by...")
         
-        # Keep session alive
-        input("Press Enter when you're ready to close this session...")
+        # Keep session alive and watch its latency until the sale
+        monitor = SessionMonitor(
+            buyer.driver, buyer.base_url,
+            interval=buyer.settings['health_interval'],
+            health_url=buyer.settings['health_url'],
+            thresholds_ms=buyer.settings['health_thresholds_ms'],
+            on_sample=print_health,
+            pause_dir=buyer.settings['sale_lock_dir'],
+            pause_max_age=buyer.settings['sale_lock_max_age'],
+            until=until
+        )
+        monitor.start()
+        print("🩺 Health monitor running (round trip / script / navigation, ms)")
+        input("Press Enter when you're ready to close this session...\n")
+        monitor.stop()
         
         return True
         
@@ -55,4 +107,7 @@ def prepare_flash_sale_session():
         print("🔄 Browser session will remain open for flash sale...")
 
 if __name__ == "__main__":
-    prepare_flash_sale_session()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Prepare and monitor a browser session for a flash sale")
+    parser.add_argument('--until', type=sale_time, metavar='HH:MM[:SS]',
+                        help="Stop the health monitor at this local time (the sale start)")
+    prepare_flash_sale_session(parser.parse_args().until)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Browser Cache Primer
+Load the search, product and cart pages for each target into a managed browser
+profile, so the disk cache already holds their scripts, stylesheets and sprites
+when a sale run starts.
+
+Usage:
+    python prime_cache.py "product name"                   # profile "default"
+    python prime_cache.py "item one" "item two" --browser-profile sale --passes 2
+
+A second pass reloads the same pages and reports how much was served from the
+cache. Run the buyer with "browser_profile" set under settings (or start Chrome
+with ./start_chrome_debug.sh, which uses the same profiles) to benefit from it.
+"""
+
+import sys
+import os
+import argparse
+from urllib.parse import quote_plus
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+
+
+def prime_pages(buyer, targets):
+    """Yield (page, url) for home, then search, first product and cart for each target."""
+    yield 'home', buyer.base_url
+    for target in targets:
+        yield 'search', f"{buyer.base_url}/s?k={quote_plus(target)}"
+        records = [record for record in buyer.fetch_search_results(target) if not record['sponsored']]
+        if records:
+            yield 'product', records[0]['href']
+    yield 'cart', f"{buyer.base_url}/gp/cart/view.html"
+
+
+def main():
+    """Prime the profile's cache and print per-page cache hit rates for every pass."""
+    parser = argparse.ArgumentParser(description="Prime a managed browser profile's HTTP cache")
+    parser.add_argument('targets', nargs='+', help="Product names whose pages should be cached")
+    # Not --profile: in buy.py that selects a config file
+    parser.add_argument('--browser-profile', default='default',
+                        help="Managed browser profile name under browser_profiles/ (default: default)")
+    parser.add_argument('--config', default='config/config.json')
+    parser.add_argument('--passes', type=int, default=2, help="Load the pages this many times (default: 2)")
+    parser.add_argument('--attach', action='store_true',
+                        help="Prime through the Chrome on the debug port instead of launching the profile")
+    args = parser.parse_args()
+
+    buyer = AmazonAutoBuyer(args.config, settings={
+        'browser_profile': args.browser_profile,
+        'reuse_existing_browser': args.attach,
+        'cache_stats': True,
+    })
+    buyer.interactive = False
+
+    try:
+        buyer.setup_driver()
+        if not buyer.login_to_amazon():
+            print("❌ Login failed! Cached pages would not match a logged-in session.")
+            return 1
+        pages = list(prime_pages(buyer, args.targets))
+        buyer.log_cache_stats('warm-up')
+
+        print(f"{'pass':>4} {'page':>8} {'static hits':>12} {'hit rate':>9} {'KB':>8}  url")
+        for number in range(1, args.passes + 1):
+            for page, url in pages:
+                buyer.driver.get(url)
+                stats = buyer.log_cache_stats(f"{page} pass {number}")
+                if not stats:
+                    continue
+                rate = '-' if stats['static_hit_rate'] is None else f"{stats['static_hit_rate']:.0%}"
+                print(f"{number:>4} {page:>8} {stats['static_hits']:>5}/{stats['static_requests']:<6} "
+                      f"{rate:>9} {stats['bytes_transferred'] / 1024:>8.0f}  {url}")
+        print(f"✅ Profile '{args.browser_profile}' primed for {len(args.targets)} target(s)")
+        return 0
+
+    finally:
+        # A launched profile must shut down cleanly so the cache index is written to disk
+        if buyer.driver and not args.attach:
+            buyer.driver.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
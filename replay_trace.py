@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Offline Trace Replay
+Run a (possibly modified) AmazonAutoBuyer against a recorded command trace and
+project its end-to-end time and command count without a live browser.
+
+Usage:
+    python replay_trace.py logs/traces/trace_20240101_120000.jsonl "product name"
+    python replay_trace.py TRACE "product name" --buyer my_strategy:FasterBuyer
+"""
+
+import sys
+import os
+import time
+import argparse
+import importlib
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+from command_trace import ReplayDriver, summarize_trace
+
+
+def load_buyer_class(spec):
+    """Load a buyer class from a 'module:Class' spec."""
+    if not spec:
+        return AmazonAutoBuyer
+    module_name, _, class_name = spec.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name or 'AmazonAutoBuyer')
+
+
+def replay(trace_path, product_name, buyer_class=AmazonAutoBuyer, mode='flash', simulate_latency=True):
+    """Replay a trace through a buyer and return the projected run statistics."""
+    # Never record a replay back into a new trace, and never close a real browser
+    buyer = buyer_class(settings={'trace_commands': False, 'reuse_existing_browser': True})
+    buyer.driver = ReplayDriver(trace_path, simulate_latency=simulate_latency)
+
+    start_time = time.perf_counter()
+    if mode == 'flash':
+        success = buyer.flash_sale_purchase(product_name)
+    else:
+        success = buyer.complete_purchase(product_name)
+    elapsed = time.perf_counter() - start_time
+
+    stats = buyer.driver.replay.report()
+    stats['success'] = success
+    # Without sleeping, add the recorded browser latency back onto the Python time
+    projected = elapsed if simulate_latency else elapsed + stats['simulated_browser_time']
+    stats['projected_time'] = round(projected, 3)
+    return stats
+
+
+def main():
+    """Replay a trace and compare it with the recorded live run."""
+    parser = argparse.ArgumentParser(description="Replay a recorded WebDriver trace offline")
+    parser.add_argument('trace', help="Path to a JSON-lines trace recorded with trace_commands")
+    parser.add_argument('product', help="Product name passed to the buyer")
+    parser.add_argument('--buyer', help="Modified buyer class as module:Class (default: AmazonAutoBuyer)")
+    parser.add_argument('--mode', choices=['flash', 'normal'], default='flash')
+    parser.add_argument('--no-sleep', action='store_true',
+                        help="Do not sleep for recorded latencies; project time from the trace instead")
+    args = parser.parse_args()
+
+    recorded = summarize_trace(args.trace)
+    projected = replay(args.trace, args.product, load_buyer_class(args.buyer),
+                       args.mode, simulate_latency=not args.no_sleep)
+
+    print("📼 TRACE REPLAY")
+    print("=" * 45)
+    print(f"Recorded run:  {recorded['commands']} commands, {recorded['duration']:.2f}s")
+    print(f"Replayed run:  {projected['commands']} commands, {projected['projected_time']:.2f}s projected")
+    print(f"   matched from trace:  {projected['matched']}")
+    print(f"   simulated from DOM:  {projected['simulated']}")
+    print(f"   outcome:             {'success' if projected['success'] else 'failed'}")
+    delta = projected['projected_time'] - recorded['duration']
+    print(f"Difference:    {delta:+.2f}s, {projected['commands'] - recorded['commands']:+d} commands")
+    print("=" * 45)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Watchlist Mode
+Buy every target in the config watchlist from one logged-in browser session.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_buyer import AmazonAutoBuyer
+from watchlist import WatchlistEngine, load_watchlist
+
+
+def watchlist_mode():
+    """Run all watchlist targets across tabs and report per-target outcomes."""
+    print("📋 WATCHLIST MODE")
+    print("=" * 50)
+
+    # Navigations must not block the shared driver, or tab page loads cannot overlap
+    buyer = AmazonAutoBuyer(settings={'page_load_strategy': 'none'})
+    targets = load_watchlist(buyer.config)
+    if not targets:
+        print("❌ No watchlist targets in config/config.json. Exiting...")
+        return
+
+    for target in targets:
+        limit = f" (max {target['max_price']})" if target['max_price'] is not None else ""
+        print(f"🎯 [{target['priority']}] {target['name']}{limit}")
+
+    buyer.setup_driver()
+    if not buyer.login_to_amazon():
+        print("❌ Login failed! Please check credentials.")
+        return
+
+    engine = WatchlistEngine(buyer, targets)
+    print("🗂️  Opening one tab per target...")
+    engine.prepare()
+
+    print("🚀 Watching targets...")
+    print("-" * 50)
+    results = engine.run()
+
+    print("-" * 50)
+    for result in results:
+        icon = "✅" if result['status'] == 'added' else "❌"
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result['timings'].items())
+        print(f"{icon} {result['name']}: {result['status']} ({phases})")
+        if result['detail']:
+            print(f"   {result['detail']}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    watchlist_mode()
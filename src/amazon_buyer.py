@@ -4,33 +4,191 @@ Amazon Auto-Buyer
 A Python script to automate Amazon product search, selection, and checkout.
 """
 
+import re
 import time
 import json
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
+from contextlib import contextmanager
+from urllib.parse import quote_plus
+# Only the cheap exceptions module up front: selenium.webdriver and the support
+# modules are imported by the methods that need them, so import stays fast
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from buyer_config import load_config, resolve_settings
+
+
+# Click the first visible "Proceed to Buy" control on the add-to-cart confirmation panel
+PROCEED_TO_BUY_SCRIPT = """
+var selectors = ["#sw-ptc-form input[name='proceedToRetailCheckout']",
+                 "#attach-sidesheet-checkout-button input",
+                 "#hlb-ptc-btn-native",
+                 "input[name='proceedToRetailCheckout']"];
+for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (el && !el.disabled && el.getClientRects().length) {
+        el.click();
+        return selectors[i];
+    }
+}
+return null;
+"""
+
+# Fetch search results without navigating and parse them off-DOM into plain records
+FETCH_SEARCH_SCRIPT = """
+var done = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: 'include'})
+    .then(function (response) {
+        return response.text().then(function (html) { return [response.url, html]; });
+    })
+    .then(function (result) {
+        var doc = new DOMParser().parseFromString(result[1], 'text/html');
+        var records = [];
+        doc.querySelectorAll("[data-component-type='s-search-result']").forEach(function (tile) {
+            var link = tile.querySelector("h2 a, a.a-link-normal[href*='/dp/']");
+            if (!link || !link.getAttribute('href')) { return; }
+            var price = tile.querySelector('.a-price .a-offscreen');
+            records.push({
+                asin: tile.getAttribute('data-asin'),
+                title: (tile.querySelector('h2') || link).textContent.trim(),
+                href: new URL(link.getAttribute('href'), result[0]).href,
+                price: price ? price.textContent.trim() : null,
+                sponsored: !!tile.querySelector('.puis-sponsored-label-text, .s-sponsored-label-text')
+            });
+        });
+        done({records: records});
+    })
+    .catch(function (error) { done({error: String(error)}); });
+"""
+
+# Any of these means the product page has rendered far enough to act on
+PRODUCT_PAGE_SELECTOR = "#productTitle, .product-title, h1.a-size-large, [data-feature-name='productTitle']"
+
+# ASIN in a product page URL
+ASIN_PATTERN = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})')
+
+# Extended list of selectors for "Add to Cart" button (Amazon changes these frequently)
+ADD_TO_CART_SELECTORS = [
+    "#add-to-cart-button",
+    "input[name='submit.add-to-cart']",
+    "[data-testid='add-to-cart-button']",
+    "input[value='Add to Cart']",
+    "button[name='submit.add-to-cart']",
+    ".a-button-input[aria-labelledby='submit.add-to-cart-announce']",
+    "input[title='Add to Cart']",
+    "input[alt='Add to Cart']",
+    "#add-to-cart-button-ubb",
+    "button[data-action='add-to-cart']",
+    ".a-button[data-action='add-to-cart']",
+    "input.a-button-input[name='submit.add-to-cart']",
+    "input[type='submit'][name*='add-to-cart']",
+    "button[type='submit'][name*='add-to-cart']",
+    ".add-to-cart-button",
+    "[id*='add-to-cart']",
+    "[class*='add-to-cart']"
+]
+
+# Classify the product page in one call: buy box, variant selection, offer listing only, or out of stock
+PRODUCT_PAGE_SCRIPT = """
+var selectors = arguments[0];
+function usable(el) { return el && !el.disabled && el.getClientRects().length > 0; }
+function clean(text) { return (text || '').replace(/\\s+/g, ' ').trim(); }
+
+var page = {kind: 'unknown', button: null, selector: null, variants: [], offers: null, availability: null};
+for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (usable(el)) { page.button = el; page.selector = selectors[i]; break; }
+}
+
+document.querySelectorAll("[id^='variation_'], [id^='inline-twister-row-']").forEach(function (row) {
+    var dimension = {name: row.id.replace(/^variation_|^inline-twister-row-/, ''), selected: null, options: []};
+    row.querySelectorAll("li[data-defaultasin], li[data-asin], li[data-dp-url], option[value*=',']").forEach(function (el) {
+        var label = el.tagName === 'OPTION' ? el.textContent
+            : el.getAttribute('title') || (el.querySelector('img') || {}).alt || el.textContent;
+        var option = {
+            label: clean(label).replace(/^Click to select /, ''),
+            asin: el.getAttribute('data-defaultasin') || el.getAttribute('data-asin')
+                || (el.tagName === 'OPTION' ? el.value.split(',')[1] : null),
+            url: el.getAttribute('data-dp-url'),
+            available: !el.disabled && !/unavailable/i.test(el.className)
+        };
+        if (el.selected || /swatchSelect|a-button-selected/.test(el.className)) {
+            dimension.selected = option.label;
+        }
+        if (option.asin || option.url) { dimension.options.push(option); }
+    });
+    if (dimension.options.length) { page.variants.push(dimension); }
+});
+
+var offers = document.querySelector("#buybox-see-all-buying-choices a, a[href*='/gp/offer-listing/'], #aod-ingress-link");
+var availability = document.querySelector('#availability, #outOfStock');
+page.availability = availability ? clean(availability.textContent) : null;
+
+if (page.button) {
+    page.kind = 'buybox';
+} else if (page.variants.some(function (d) { return !d.selected; })) {
+    page.kind = 'variants';
+} else if (usable(offers)) {
+    page.kind = 'offers';
+    page.offers = offers;
+} else if (/unavailable|out of stock/i.test(page.availability || '')) {
+    page.kind = 'oos';
+}
+return page;
+"""
+
+# Pick the cheapest offer in the open offer listing with a usable Add to Cart, optionally under a price cap
+CHEAPEST_OFFER_SCRIPT = """
+var maxPrice = arguments[0];
+var best = null;
+document.querySelectorAll('#aod-pinned-offer, #aod-offer, .olpOffer').forEach(function (offer) {
+    var button = offer.querySelector("input[name='submit.addToCart'], input[name='submit.add-to-cart']");
+    var price = offer.querySelector('.a-price .a-offscreen, .olpOfferPrice');
+    if (!button || button.disabled || !price) { return; }
+    var value = parseFloat(price.textContent.replace(/[^0-9.]/g, ''));
+    if (isNaN(value) || (maxPrice !== null && value > maxPrice)) { return; }
+    if (!best || value < best.price) {
+        var seller = offer.querySelector('#aod-offer-soldBy a, .olpSellerName');
+        best = {button: button, price: value, seller: seller ? seller.textContent.trim() : null};
+    }
+});
+return best;
+"""
 
 
 class AmazonAutoBuyer:
-    def __init__(self, config_path='config/config.json'):
+    def __init__(self, config_path='config/config.json', settings=None, config=None):
         """Initialize the Amazon Auto Buyer with configuration."""
-        self.config = self.load_config(config_path)
+        # Callers that already parsed the config (e.g. the CLI) pass it in to skip re-reading
+        self.config = config if config is not None else self.load_config(config_path)
+        # Settings are resolved once; per-run overrides (e.g. a worker's debug port) win
+        self.settings = resolve_settings(self.config, settings)
+        self.interactive = True
         self.driver = None
+        # True when this buyer started the browser (not attached to a running one)
+        self.launched_browser = False
+        self.command_trace = None
+        self.diagnostics = None
+        self.cart_window = None
+        self.phase_timings = {}
+        self.profiler = None
+        self.winning_selectors = {}
+        self.rehearsal_report = None
+        self._rehearsal_cache = None
+        self.recent_logs = None
+        self.base_url = self.settings['base_url']
         self.setup_logging()
         
+    @property
+    def rehearsal_cache(self):
+        """Selector winners and product ASINs from the last pre-sale rehearsal, loaded on first use."""
+        if self._rehearsal_cache is None:
+            from rehearsal import RehearsalCache
+            self._rehearsal_cache = RehearsalCache(self.settings['rehearsal_cache_file'],
+                                                   self.settings['rehearsal_max_age'])
+        return self._rehearsal_cache
+    
     def load_config(self, config_path):
         """Load configuration from JSON file."""
-        try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logging.error(f"Config file not found: {config_path}")
-            return {}
+        return load_config(config_path)
     
     def setup_logging(self):
         """Set up logging configuration."""
@@ -42,19 +200,47 @@ class AmazonAutoBuyer:
                 logging.StreamHandler()
             ]
         )
+    
+    def _keep_recent_logs(self):
+        """Keep recent records in memory so failure diagnostics can include them.
+
+        Installed once driver work starts rather than in __init__, so a run that
+        never reaches the browser does not import the diagnostics module.
+        """
+        if self.recent_logs is not None:
+            return
+        from diagnostics import RecentLogHandler
+        root_logger = logging.getLogger()
+        existing = [h for h in root_logger.handlers if isinstance(h, RecentLogHandler)]
+        self.recent_logs = existing[0] if existing else RecentLogHandler()
+        if not existing:
+            root_logger.addHandler(self.recent_logs)
         
     def setup_driver(self):
         """Set up Chrome WebDriver with options."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        self._keep_recent_logs()
+        if self.driver is not None:
+            # A driver was attached up front (e.g. a replay driver) - keep using it
+            logging.info("Using already attached WebDriver")
+            return
+        
         chrome_options = Options()
         
         # Check if we should reuse existing browser session
-        reuse_browser = self.config.get('settings', {}).get('reuse_existing_browser', True)
+        reuse_browser = self.settings['reuse_existing_browser']
         
         if reuse_browser:
             # Try to connect to existing Chrome session
             try:
                 # Add debugging port to connect to existing Chrome session
-                chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+                chrome_options.add_experimental_option("debuggerAddress", self.settings['debugger_address'])
+                chrome_options.page_load_strategy = self.settings['page_load_strategy']
+                if self.settings['cache_stats']:
+                    from cache_stats import enable_network_log
+                    enable_network_log(chrome_options)
                 logging.info("Attempting to connect to existing Chrome session...")
             except Exception as e:
                 logging.warning(f"Could not connect to existing session: {e}")
@@ -62,69 +248,15 @@ class AmazonAutoBuyer:
                 reuse_browser = False
         
         if not reuse_browser:
-            # Add user preferences for new session
-            if self.config.get('headless', False):
-                chrome_options.add_argument('--headless')
-                
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Comprehensive arguments to suppress warnings and improve stability
-            chrome_options.add_argument('--disable-background-networking')
-            chrome_options.add_argument('--disable-background-timer-throttling')
-            chrome_options.add_argument('--disable-renderer-backgrounding')
-            chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-            chrome_options.add_argument('--disable-client-side-phishing-detection')
-            chrome_options.add_argument('--disable-sync')
-            chrome_options.add_argument('--disable-default-apps')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=TranslateUI')
-            chrome_options.add_argument('--disable-ipc-flooding-protection')
-            chrome_options.add_argument('--log-level=3')  # Suppress INFO, WARNING and ERROR logs
-            
-            # Additional arguments to completely disable Google services and GCM
-            chrome_options.add_argument('--disable-component-update')
-            chrome_options.add_argument('--disable-background-mode')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            chrome_options.add_argument('--disable-features=UserAgentClientHint')
-            chrome_options.add_argument('--disable-sync-preferences')
-            chrome_options.add_argument('--disable-component-extensions-with-background-pages')
-            chrome_options.add_argument('--disable-background-downloads')
-            chrome_options.add_argument('--disable-hang-monitor')
-            chrome_options.add_argument('--disable-prompt-on-repost')
-            chrome_options.add_argument('--disable-domain-reliability')
-            chrome_options.add_argument('--disable-features=OptimizationHints')
-            chrome_options.add_argument('--gcm-checkin-url=')
-            chrome_options.add_argument('--gcm-mcs-endpoint=')
-            chrome_options.add_argument('--gcm-registration-url=')
-            chrome_options.add_argument('--disable-cloud-import')
-            chrome_options.add_argument('--disable-fetching-hints-at-navigation-start')
-            
-            # Chrome stability and crash prevention
-            chrome_options.add_argument('--disable-gpu-sandbox')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-first-run')
-            chrome_options.add_argument('--no-default-browser-check')
-            chrome_options.add_argument('--disable-crash-reporter')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--disable-in-process-stack-traces')
-            chrome_options.add_argument('--max_old_space_size=1024')
-            chrome_options.add_argument('--memory-pressure-off')
-            # Note: --single-process removed as it can cause instability on macOS
-            
-            # Set user agent to avoid detection
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+            chrome_options = self._build_chrome_options()
         
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
+            self.launched_browser = not reuse_browser
             if not reuse_browser:
                 self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._apply_url_blocking()
+            self._start_command_trace()
             logging.info("WebDriver setup completed successfully")
         except Exception as e:
             if reuse_browser:
@@ -134,11 +266,33 @@ class AmazonAutoBuyer:
             else:
                 raise e
     
-    def _create_new_chrome_session(self):
-        """Create a new Chrome session with all optimizations."""
+    def _build_chrome_options(self):
+        """Build Chrome options for a new session according to the launch profile."""
+        from selenium.webdriver.chrome.options import Options
+        from chrome_launcher import DENSE_PROFILE_ARGUMENTS, browser_profile_dir, profile_arguments
+        
         chrome_options = Options()
-        if self.config.get('headless', False):
+        chrome_options.page_load_strategy = self.settings['page_load_strategy']
+        dense = self.settings['launch_profile'] == 'dense'
+        
+        if dense:
+            # Dense profile: always headless, fewer renderers, small caches
+            chrome_options.add_argument('--headless=new')
+            for argument in DENSE_PROFILE_ARGUMENTS:
+                chrome_options.add_argument(argument)
+        elif self.settings['headless']:
             chrome_options.add_argument('--headless')
+        
+        # Managed profile: cookies and the HTTP disk cache persist between sessions
+        # (its --disk-cache-size comes after the dense one, so it wins)
+        if self.settings['browser_profile']:
+            profile_dir = browser_profile_dir(self.settings['browser_profiles_dir'], self.settings['browser_profile'])
+            for argument in profile_arguments(profile_dir, self.settings['browser_cache_mb']):
+                chrome_options.add_argument(argument)
+            logging.info(f"Using browser profile: {profile_dir}")
+        if self.settings['cache_stats']:
+            from cache_stats import enable_network_log
+            enable_network_log(chrome_options)
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
@@ -187,16 +341,65 @@ class AmazonAutoBuyer:
         chrome_options.add_argument('--disable-crash-reporter')
         chrome_options.add_argument('--disable-logging')
         chrome_options.add_argument('--disable-in-process-stack-traces')
-        chrome_options.add_argument('--max_old_space_size=1024')
-        chrome_options.add_argument('--memory-pressure-off')
+        if not dense:
+            chrome_options.add_argument('--max_old_space_size=1024')
+            chrome_options.add_argument('--memory-pressure-off')
         # Note: --single-process removed as it can cause instability on macOS
         
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
         
+        # Images are only worth disabling when requests are being blocked anyway
+        if self.settings['block_url_patterns']:
+            chrome_options.add_experimental_option(
+                'prefs', {'profile.managed_default_content_settings.images': 2}
+            )
+        
+        return chrome_options
+    
+    def _apply_url_blocking(self):
+        """Block configured URL patterns (ads, trackers, images) via DevTools.
+
+        Network.setBlockedURLs only applies to the current tab, so every tab
+        the buyer opens goes through open_tab, which calls this again.
+        """
+        patterns = self.settings['block_url_patterns']
+        if not patterns or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            logging.info(f"Blocking {len(patterns)} URL patterns")
+        except Exception as e:
+            logging.warning(f"Could not enable URL blocking: {e}")
+    
+    def _create_new_chrome_session(self):
+        """Create a new Chrome session with all optimizations."""
+        from selenium import webdriver
+        
+        self._keep_recent_logs()
+        chrome_options = self._build_chrome_options()
+        
         self.driver = webdriver.Chrome(options=chrome_options)
+        self.launched_browser = True
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self._apply_url_blocking()
+        self._start_command_trace()
         logging.info("New Chrome session created successfully")
     
+    def _start_command_trace(self):
+        """Record every WebDriver command to a trace file if enabled in settings."""
+        if not self.settings['trace_commands']:
+            return
+        
+        from command_trace import TraceRecorder
+        
+        if self.command_trace:
+            self.command_trace.close()
+        trace_path = f"{self.settings['trace_dir']}/trace_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+        self.command_trace = TraceRecorder.attach(
+            self.driver, trace_path, snapshot_dom=self.settings['trace_dom_snapshots']
+        )
+    
     def _recover_driver(self):
         """Attempt to recover from a Chrome crash."""
         try:
@@ -213,19 +416,84 @@ class AmazonAutoBuyer:
             self._create_new_chrome_session()
             
             # Verify recovery
-            self.driver.get("https://www.amazon.in")
+            self.driver.get(self.base_url)
             logging.info("Chrome driver recovery successful")
             
         except Exception as e:
             logging.error(f"Chrome driver recovery failed: {e}")
             raise Exception("Could not recover Chrome session")
         
+    @contextmanager
+    def _phase(self, name):
+        """Record the duration of a purchase phase in self.phase_timings."""
+        start = time.perf_counter()
+        if self.profiler:
+            self.profiler.enter(name)
+        try:
+            yield
+        finally:
+            if self.profiler:
+                self.profiler.exit()
+            self.phase_timings[name] = round(time.perf_counter() - start, 3)
+    
+    def _start_profiler(self, run_name):
+        """Start the per-phase Python profiler if enabled in settings."""
+        if not self.settings['profile_python']:
+            return
+        from phase_profiler import PhaseProfiler
+        self.profiler = PhaseProfiler(self.settings['profile_dir'], self.settings['profile_interval'])
+        self.profiler.start(run_name)
+    
+    def _stop_profiler(self):
+        """Stop the profiler and write its per-phase output."""
+        if not self.profiler:
+            return
+        try:
+            self.profiler.stop()
+        except Exception as e:
+            logging.warning(f"Could not write profile: {e}")
+        self.profiler = None
+    
+    def log_cache_stats(self, tag):
+        """Log browser cache hits and misses for the requests since the last call."""
+        from cache_stats import collect
+        try:
+            stats = collect(self.driver)
+        except Exception as e:
+            logging.warning(f"CACHE [{tag}]: stats unavailable: {e}")
+            return None
+        rate = 'n/a' if stats['static_hit_rate'] is None else f"{stats['static_hit_rate']:.0%}"
+        logging.info(
+            f"CACHE [{tag}]: static assets {stats['static_hits']}/{stats['static_requests']} from cache ({rate}), "
+            f"{stats['requests']} requests, {stats['bytes_transferred'] / 1024:.0f} KB transferred via {stats['source']}"
+        )
+        return stats
+    
+    def _capture_diagnostics(self, tag):
+        """Queue a screenshot, DOM snapshot and recent logs for background writing."""
+        try:
+            if self.diagnostics is None:
+                from diagnostics import DiagnosticsCapture
+                self._keep_recent_logs()
+                self.diagnostics = DiagnosticsCapture(
+                    self.recent_logs,
+                    directory=self.settings['diagnostics_dir'],
+                    max_bytes=int(self.settings['diagnostics_max_mb'] * 1024 * 1024)
+                )
+            self.diagnostics.capture(self.driver, tag)
+        except Exception as e:
+            logging.warning(f"Could not capture diagnostics: {e}")
+        
     def login_to_amazon(self):
         """Login to Amazon with stored credentials."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             # First, check if already logged in by visiting Amazon main page
             logging.info("Checking if already logged in to Amazon...")
-            self.driver.get("https://www.amazon.in")
+            self.driver.get(self.base_url)
             
             # Wait for page to load
             WebDriverWait(self.driver, 10).until(
@@ -244,7 +512,7 @@ class AmazonAutoBuyer:
             
             # Not logged in, proceed with login
             logging.info("Not logged in, navigating to Amazon login page...")
-            self.driver.get("https://www.amazon.in/ap/signin?openid.pape.max_auth_age=0&openid.return_to=https%3A%2F%2Fwww.amazon.in%2F%3Fref_%3Dnav_signin&openid.identity=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.assoc_handle=inflex&openid.mode=checkid_setup&openid.claimed_id=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.ns=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0")
+            self.driver.get(f"{self.base_url}/ap/signin?openid.pape.max_auth_age=0&openid.return_to=https%3A%2F%2Fwww.amazon.in%2F%3Fref_%3Dnav_signin&openid.identity=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.assoc_handle=inflex&openid.mode=checkid_setup&openid.claimed_id=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.ns=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0")
             
             # Enter email
             email_field = WebDriverWait(self.driver, 10).until(
@@ -280,12 +548,17 @@ class AmazonAutoBuyer:
     
     def search_product(self, product_name):
         """Search for a product on Amazon."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             logging.info(f"Searching for product: {product_name}")
             
-            # Navigate to Amazon main page if not already there
-            if "amazon.com" not in self.driver.current_url:
-                self.driver.get("https://www.amazon.in")
+            # Any page of the store has the search box; only navigate when off-site
+            if not self.driver.current_url.startswith(self.base_url):
+                self.driver.get(self.base_url)
             
             # Find search box
             search_box = WebDriverWait(self.driver, 10).until(
@@ -309,8 +582,84 @@ class AmazonAutoBuyer:
             logging.error(f"Search failed: {str(e)}")
             return False
     
+    def fetch_search_results(self, product_name):
+        """Fetch search results in-page (no navigation) and parse them into records."""
+        try:
+            logging.info(f"Fetching search results for: {product_name}")
+            
+            # fetch() must run on an Amazon page so the session cookies are sent
+            if not self.driver.current_url.startswith(self.base_url):
+                self.driver.get(self.base_url)
+            
+            search_url = f"{self.base_url}/s?k={quote_plus(product_name)}"
+            result = self.driver.execute_async_script(FETCH_SEARCH_SCRIPT, search_url)
+            if result.get('error'):
+                raise Exception(result['error'])
+            
+            records = result.get('records', [])
+            logging.info(f"Parsed {len(records)} search results off-DOM")
+            return records
+            
+        except Exception as e:
+            logging.error(f"Search fetch failed: {str(e)}")
+            return []
+    
+    def _goto_product_page(self, url, timeout=10):
+        """Navigate to a product page and wait until that page, not the previous one, is shown.
+
+        Under pageLoadStrategy "none" get() returns while the previous page is
+        still in the tab, and a previous product page already matches
+        PRODUCT_PAGE_SELECTOR. So the location must first show the requested
+        ASIN or, for URLs without one, have changed.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        match = ASIN_PATTERN.search(url)
+        previous = None if match else self.driver.current_url
+        self.driver.get(url)
+        
+        def arrived(driver):
+            here = driver.current_url
+            if match:
+                found = ASIN_PATTERN.search(here)
+                if not found or found.group(1) != match.group(1):
+                    return False
+            elif here == previous:
+                return False
+            return driver.find_elements(By.CSS_SELECTOR, PRODUCT_PAGE_SELECTOR)
+        
+        WebDriverWait(self.driver, timeout).until(arrived)
+    
+    def open_product(self, record):
+        """Navigate straight to a search result record and wait for the product page."""
+        try:
+            logging.info(f"Opening product: {record['title']} ({record['href']})")
+            self._goto_product_page(record['href'])
+            logging.info(f"Selected product: {record['title']}")
+            return True
+            
+        except Exception as e:
+            logging.error(f"Opening product failed: {str(e)}")
+            return False
+    
+    def search_and_open_product(self, product_name):
+        """Render-free search: parse results off-DOM, then navigate once to the first organic result."""
+        with self._phase('search'):
+            records = self.fetch_search_results(product_name)
+        if not records:
+            return False
+        
+        organic = [record for record in records if not record['sponsored']]
+        with self._phase('select'):
+            return self.open_product((organic or records)[0])
+    
     def select_first_product(self):
         """Select the first available product from search results with crash recovery."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         max_retries = 2
         
         for attempt in range(max_retries):
@@ -346,14 +695,15 @@ class AmazonAutoBuyer:
                 selector_used = None
                 product_href = None
                 
-                # Try each selector until one works - OPTIMIZED FOR SPEED
-                for selector in product_selectors:
+                # Try each selector until one works, last rehearsal's winner first - OPTIMIZED FOR SPEED
+                for selector in self.rehearsal_cache.rank('product', product_selectors):
                     try:
                         # Flash sale mode: instant detection (0.3 seconds max)
                         first_product = WebDriverWait(self.driver, 0.3).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                         )
                         selector_used = selector
+                        self.winning_selectors['product'] = selector
                         logging.info(f"Found product: {selector}")
                         break
                     except TimeoutException:
@@ -361,12 +711,8 @@ class AmazonAutoBuyer:
                 
                 if not first_product:
                     logging.error("Could not find any product links with available selectors")
-                    # Take a screenshot for debugging
-                    try:
-                        self.driver.save_screenshot("logs/product_selection_failed.png")
-                        logging.info("Screenshot saved to logs/product_selection_failed.png")
-                    except:
-                        pass
+                    # Capture diagnostics off the critical path
+                    self._capture_diagnostics("product_selection_failed")
                     return False
                 
                 # Get product info before clicking for logging
@@ -445,19 +791,15 @@ class AmazonAutoBuyer:
                         try:
                             self._recover_driver()
                             # Re-search for the product after recovery
-                            self.driver.get("https://www.amazon.in")
+                            self.driver.get(self.base_url)
                             time.sleep(1)
                             continue
                         except Exception as recovery_e:
                             logging.error(f"Driver recovery failed: {recovery_e}")
                 
-                # Take a screenshot for debugging on final attempt
+                # Capture diagnostics on final attempt
                 if attempt == max_retries - 1:
-                    try:
-                        self.driver.save_screenshot("logs/product_selection_error.png")
-                        logging.info("Error screenshot saved to logs/product_selection_error.png")
-                    except:
-                        pass
+                    self._capture_diagnostics("product_selection_error")
                 
                 if attempt == max_retries - 1:
                     return False
@@ -466,37 +808,102 @@ class AmazonAutoBuyer:
         
         return False
     
-    def add_to_cart(self, flash_sale_mode=True):
-        """Add the selected product to cart - OPTIMIZED FOR FLASH SALES."""
+    def analyze_product_page(self):
+        """Classify the current product page in a single in-page call."""
         try:
-            logging.info("FLASH SALE: Adding to cart...")
-            
-            # Extended list of selectors for "Add to Cart" button (Amazon changes these frequently)
-            add_to_cart_selectors = [
-                "#add-to-cart-button",
-                "input[name='submit.add-to-cart']",
-                "[data-testid='add-to-cart-button']",
-                "input[value='Add to Cart']",
-                "button[name='submit.add-to-cart']",
-                ".a-button-input[aria-labelledby='submit.add-to-cart-announce']",
-                "input[title='Add to Cart']",
-                "input[alt='Add to Cart']",
-                "#add-to-cart-button-ubb",
-                "button[data-action='add-to-cart']",
-                ".a-button[data-action='add-to-cart']",
-                "input.a-button-input[name='submit.add-to-cart']",
-                "input[type='submit'][name*='add-to-cart']",
-                "button[type='submit'][name*='add-to-cart']",
-                ".add-to-cart-button",
-                "[id*='add-to-cart']",
-                "[class*='add-to-cart']"
-            ]
-            
-            add_to_cart_btn = None
-            selector_used = None
-            
-            # Try each selector until one works - FLASH SALE OPTIMIZED
-            for selector in add_to_cart_selectors:
+            selectors = self.rehearsal_cache.rank('add_to_cart', ADD_TO_CART_SELECTORS)
+            page = self.driver.execute_script(PRODUCT_PAGE_SCRIPT, selectors)
+            logging.info(f"Product page: {page['kind']} (availability: {page['availability']})")
+            return page
+        except Exception as e:
+            logging.warning(f"Product page analysis failed: {e}")
+            return None
+
+    def _wanted_variant_option(self, page):
+        """Return the configured variant option that is not selected yet, if any."""
+        wanted = self.config.get('product_preferences', {}).get('variant') or {}
+        for dimension in page['variants']:
+            value = next((v for k, v in wanted.items() if dimension['name'].startswith(k)), None)
+            if value is None or (dimension['selected'] or '').lower() == str(value).lower():
+                continue
+
+            matches = [option for option in dimension['options'] if option['label'].lower() == str(value).lower()]
+            matches = matches or [option for option in dimension['options'] if str(value).lower() in option['label'].lower()]
+            if not matches:
+                raise Exception(f"Configured variant {dimension['name']}={value} not offered on this page")
+            if not matches[0]['available']:
+                raise Exception(f"Configured variant {dimension['name']}={value} is unavailable")
+            return matches[0]
+
+        unselected = [dimension['name'] for dimension in page['variants'] if not dimension['selected']]
+        if page['kind'] == 'variants' and unselected:
+            raise Exception(f"Variant selection required ({', '.join(unselected)}); "
+                            "set product_preferences.variant in config")
+        return None
+
+    def _open_variant(self, option):
+        """Navigate straight to a variant's own product page instead of clicking through the twister."""
+        url = f"{self.base_url}/dp/{option['asin']}?th=1&psc=1" if option['asin'] else self.base_url + option['url']
+        logging.info(f"Selecting variant: {option['label']}")
+        self._goto_product_page(url)
+
+    def _select_cheapest_offer(self, page):
+        """Open the offer listing and return the Add to Cart button of the cheapest eligible offer."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        max_price = self.config.get('purchase_limits', {}).get('max_price')
+        self.driver.execute_script("arguments[0].click();", page['offers'])
+        WebDriverWait(self.driver, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#aod-pinned-offer, #aod-offer, .olpOffer"))
+        )
+        offer = self.driver.execute_script(CHEAPEST_OFFER_SCRIPT, max_price)
+        if not offer:
+            raise Exception(f"No eligible offer{f' under {max_price}' if max_price else ''}")
+        logging.info(f"Cheapest offer: {offer['price']} from {offer['seller'] or 'unknown seller'}")
+        return offer['button']
+
+    def resolve_product_page(self):
+        """Take the fastest route to the Add to Cart button for this kind of product page.
+
+        Returns (button, route), or (None, None) when the page could not be classified
+        and the selector fallbacks should run. Out-of-stock and unresolvable variant
+        pages raise instead of exhausting the fallbacks.
+        """
+        for _ in range(3):
+            page = self.analyze_product_page()
+            if not page:
+                return None, None
+
+            option = self._wanted_variant_option(page) if page['variants'] else None
+            if option:
+                self._open_variant(option)
+                continue
+
+            if page['kind'] == 'buybox':
+                return page['button'], page['selector']
+            if page['kind'] == 'offers':
+                return self._select_cheapest_offer(page), "offer-listing"
+            if page['kind'] == 'oos':
+                raise Exception(f"Product is out of stock: {page['availability']}")
+            return None, None
+
+        raise Exception("Variant selection did not settle on a buyable product")
+
+    def find_add_to_cart_button(self, flash_sale_mode=True):
+        """Resolve the Add to Cart button without clicking it; returns (button, selector_used)."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        # One in-page analysis picks the route; only unclassified pages fall through to the selector scan
+        add_to_cart_btn, selector_used = self.resolve_product_page()
+        if add_to_cart_btn:
+            logging.info(f"Cart btn found: {selector_used}")
+        else:
+            # Try each selector until one works, last rehearsal's winner first - FLASH SALE OPTIMIZED
+            for selector in self.rehearsal_cache.rank('add_to_cart', ADD_TO_CART_SELECTORS):
                 try:
                     # Ultra-fast detection: 0.2 seconds max per selector
                     add_to_cart_btn = WebDriverWait(self.driver, 0.2).until(
@@ -507,99 +914,108 @@ class AmazonAutoBuyer:
                     break
                 except TimeoutException:
                     continue
+        
+        # FLASH SALE INSTANT FALLBACK: Try to find elements immediately
+        if not add_to_cart_btn and flash_sale_mode:
+            logging.info("FLASH: Instant fallback...")
+            try:
+                # Instant search - no waiting
+                elements = self.driver.find_elements(By.CSS_SELECTOR, "button, input[type='submit'], input[type='button']")
+                for elem in elements:
+                    try:
+                        text = (elem.text or elem.get_attribute('value') or '').lower()
+                        if 'add to cart' in text or 'add to basket' in text:
+                            if elem.is_displayed() and elem.is_enabled():
+                                add_to_cart_btn = elem
+                                logging.info(f"FLASH: Found '{text}'")
+                                break
+                    except:
+                        continue
+                if add_to_cart_btn:
+                    selector_used = "flash-instant"
+            except Exception:
+                pass
+        
+        if not add_to_cart_btn:
+            logging.error("Could not find Add to Cart button with any known selector")
+            if not flash_sale_mode:
+                logging.info("Attempting fallback: searching for buttons with 'add to cart' text...")
             
-            # FLASH SALE INSTANT FALLBACK: Try to find elements immediately
-            if not add_to_cart_btn and flash_sale_mode:
-                logging.info("FLASH: Instant fallback...")
-                try:
-                    # Instant search - no waiting
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, "button, input[type='submit'], input[type='button']")
-                    for elem in elements:
-                        try:
-                            text = (elem.text or elem.get_attribute('value') or '').lower()
-                            if 'add to cart' in text or 'add to basket' in text:
-                                if elem.is_displayed() and elem.is_enabled():
-                                    add_to_cart_btn = elem
-                                    logging.info(f"FLASH: Found '{text}'")
-                                    break
-                        except:
-                            continue
-                    if add_to_cart_btn:
-                        selector_used = "flash-instant"
-                except Exception:
-                    pass
+            # Capture diagnostics off the critical path
+            self._capture_diagnostics("add_to_cart_failed")
             
-            if not add_to_cart_btn:
-                logging.error("Could not find Add to Cart button with any known selector")
-                if not flash_sale_mode:
-                    logging.info("Attempting fallback: searching for buttons with 'add to cart' text...")
-                
-                # Take a screenshot for debugging
-                try:
-                    self.driver.save_screenshot("logs/add_to_cart_failed.png")
-                    logging.info("Screenshot saved to logs/add_to_cart_failed.png")
-                except:
-                    pass
+            # Fallback: find buttons by text content
+            try:
+                buttons = self.driver.find_elements(By.TAG_NAME, "button") + self.driver.find_elements(By.TAG_NAME, "input")
+                candidate_buttons = []
                 
-                # Fallback: find buttons by text content
-                try:
-                    buttons = self.driver.find_elements(By.TAG_NAME, "button") + self.driver.find_elements(By.TAG_NAME, "input")
-                    candidate_buttons = []
-                    
-                    for btn in buttons:
-                        try:
-                            # Get all possible text sources for the button
-                            btn_text = (
-                                btn.get_attribute('value') or 
-                                btn.text or 
-                                btn.get_attribute('title') or 
-                                btn.get_attribute('aria-label') or 
-                                btn.get_attribute('alt') or 
-                                ''
-                            ).strip().lower()
-                            
-                            # Look for cart-related text
-                            cart_phrases = [
-                                'add to cart',
-                                'add to basket', 
-                                'add item',
-                                'buy now',
-                                'purchase'
-                            ]
-                            
-                            for phrase in cart_phrases:
-                                if phrase in btn_text:
-                                    # Check if button is visible and clickable
-                                    if btn.is_displayed() and btn.is_enabled():
-                                        candidate_buttons.append((btn, btn_text, phrase))
-                                        logging.info(f"Found clickable cart button: '{btn_text}' (matched: '{phrase}')")
-                                        break
-                            
-                        except Exception as btn_e:
-                            continue
-                    
-                    # Try to use the first viable candidate
-                    if candidate_buttons:
-                        # Prioritize exact "add to cart" matches
-                        best_btn = None
-                        for btn, text, phrase in candidate_buttons:
-                            if 'add to cart' in phrase:
-                                best_btn = btn
-                                logging.info(f"Using best match: '{text}'")
-                                break
+                for btn in buttons:
+                    try:
+                        # Get all possible text sources for the button
+                        btn_text = (
+                            btn.get_attribute('value') or 
+                            btn.text or 
+                            btn.get_attribute('title') or 
+                            btn.get_attribute('aria-label') or 
+                            btn.get_attribute('alt') or 
+                            ''
+                        ).strip().lower()
                         
-                        if not best_btn:
-                            best_btn = candidate_buttons[0][0]
-                            logging.info(f"Using first candidate: '{candidate_buttons[0][1]}'")
+                        # Look for cart-related text
+                        cart_phrases = [
+                            'add to cart',
+                            'add to basket', 
+                            'add item',
+                            'buy now',
+                            'purchase'
+                        ]
+                        
+                        for phrase in cart_phrases:
+                            if phrase in btn_text:
+                                # Check if button is visible and clickable
+                                if btn.is_displayed() and btn.is_enabled():
+                                    candidate_buttons.append((btn, btn_text, phrase))
+                                    logging.info(f"Found clickable cart button: '{btn_text}' (matched: '{phrase}')")
+                                    break
                         
-                        add_to_cart_btn = best_btn
-                        selector_used = "text-based fallback"
+                    except Exception as btn_e:
+                        continue
+                
+                # Try to use the first viable candidate
+                if candidate_buttons:
+                    # Prioritize exact "add to cart" matches
+                    best_btn = None
+                    for btn, text, phrase in candidate_buttons:
+                        if 'add to cart' in phrase:
+                            best_btn = btn
+                            logging.info(f"Using best match: '{text}'")
+                            break
                     
-                except Exception as fallback_e:
-                    logging.error(f"Fallback button search failed: {fallback_e}")
+                    if not best_btn:
+                        best_btn = candidate_buttons[0][0]
+                        logging.info(f"Using first candidate: '{candidate_buttons[0][1]}'")
+                    
+                    add_to_cart_btn = best_btn
+                    selector_used = "text-based fallback"
                 
-                if not add_to_cart_btn:
-                    raise Exception("Could not find Add to Cart button even with text-based fallback")
+            except Exception as fallback_e:
+                logging.error(f"Fallback button search failed: {fallback_e}")
+            
+            if not add_to_cart_btn:
+                raise Exception("Could not find Add to Cart button even with text-based fallback")
+
+        self.winning_selectors['add_to_cart'] = selector_used
+        return add_to_cart_btn, selector_used
+
+    def add_to_cart(self, flash_sale_mode=True):
+        """Add the selected product to cart - OPTIMIZED FOR FLASH SALES."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        try:
+            logging.info("FLASH SALE: Adding to cart...")
+            add_to_cart_btn, selector_used = self.find_add_to_cart_button(flash_sale_mode)
             
             # Get button info before clicking for logging
             try:
@@ -644,21 +1060,133 @@ class AmazonAutoBuyer:
             
         except Exception as e:
             logging.error(f"Add to cart failed: {str(e)}")
-            # Take a screenshot for debugging
-            try:
-                self.driver.save_screenshot("logs/add_to_cart_error.png")
-                logging.info("Error screenshot saved to logs/add_to_cart_error.png")
-            except:
-                pass
+            # Capture diagnostics off the critical path
+            self._capture_diagnostics("add_to_cart_error")
             return False
     
+    def current_product(self):
+        """Return a product record (asin, href, title) for the product page the browser is on."""
+        match = ASIN_PATTERN.search(self.driver.current_url)
+        if not match:
+            return None
+        asin = match.group(1)
+        return {'asin': asin, 'href': f"{self.base_url}/dp/{asin}", 'title': self.driver.title}
+    
+    def _finish_rehearsal(self, product_name, stage):
+        """Time the warm fire path, update the rehearsal caches and write the go/no-go report."""
+        from rehearsal import build_report, write_report
+        
+        product = None
+        # Setup and login can happen before the sale, so they are reported apart from the fire path
+        pre_sale = {phase: self.phase_timings[phase] for phase in ('setup', 'login') if phase in self.phase_timings}
+        warm = {}
+        try:
+            product = self.current_product() if stage in ('product', 'button') else None
+            if stage == 'button' and product:
+                # Second pass over the now-cached page: what the real run will do after the ASIN cache hit
+                start = time.perf_counter()
+                self.open_product(product)
+                warm['open'] = time.perf_counter() - start
+                
+                start = time.perf_counter()
+                self.find_add_to_cart_button(flash_sale_mode=True)
+                warm['resolve'] = time.perf_counter() - start
+                
+                # One driver round trip stands in for the click itself
+                start = time.perf_counter()
+                self.driver.execute_script("return true;")
+                warm['click'] = time.perf_counter() - start
+        except Exception as e:
+            logging.warning(f"REHEARSAL: warm pass failed: {e}")
+            stage = 'product' if product else stage
+        
+        if stage == 'button':
+            self.rehearsal_cache.remember(product_name, product, self.winning_selectors)
+        self.rehearsal_report = build_report(
+            product_name, stage, product, dict(self.phase_timings), dict(self.winning_selectors),
+            warm, self.settings['rehearsal_max_fire_ms'], pre_sale
+        )
+        write_report(self.rehearsal_report, self.settings['rehearsal_dir'])
+        return self.rehearsal_report
+    
+    def open_tab(self):
+        """Open a new tab, switch to it and apply URL blocking there; return its handle."""
+        self.driver.switch_to.new_window('tab')
+        self._apply_url_blocking()
+        return self.driver.current_window_handle
+    
+    def prepare_cart_tab(self):
+        """Open the cart in a background tab so checkout can refresh it in place."""
+        try:
+            main_window = self.driver.current_window_handle
+            self.open_tab()
+            self.driver.get(f"{self.base_url}/gp/cart/view.html")
+            self.cart_window = self.driver.current_window_handle
+            self.driver.switch_to.window(main_window)
+            
+            # Remember the tab for later runs attached to the same browser
+            with open(self.settings['session_state_file'], 'w') as f:
+                json.dump({'cart_window': self.cart_window}, f)
+            
+            logging.info("Cart tab pre-opened for checkout hand-off")
+            return True
+            
+        except Exception as e:
+            logging.error(f"Could not pre-open cart tab: {str(e)}")
+            return False
+    
+    def _find_cart_window(self):
+        """Return the pre-opened cart tab handle if it is still open (it may have left the cart page)."""
+        if not self.cart_window:
+            try:
+                with open(self.settings['session_state_file'], 'r') as f:
+                    self.cart_window = json.load(f).get('cart_window')
+            except (FileNotFoundError, ValueError):
+                return None
+        
+        if self.cart_window in self.driver.window_handles:
+            return self.cart_window
+        return None
+    
+    def _wait_for_checkout_page(self):
+        """Wait until the browser has left the cart for the checkout (or re-auth) page."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        WebDriverWait(self.driver, 10).until(
+            lambda driver: any(part in driver.current_url for part in ("/gp/buy/", "/checkout/", "/ap/signin"))
+        )
+    
     def proceed_to_checkout(self):
         """Proceed to checkout process."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             logging.info("Proceeding to checkout...")
             
-            # Navigate to cart first
-            self.driver.get("https://www.amazon.in/gp/cart/view.html")
+            # Fastest: "Proceed to Buy" on the add-to-cart confirmation panel, found and clicked in one call
+            clicked = self.driver.execute_script(PROCEED_TO_BUY_SCRIPT)
+            if clicked:
+                logging.info(f"Checkout via confirmation panel: {clicked}")
+                self._wait_for_checkout_page()
+                logging.info("Navigated to checkout page")
+                return True
+            
+            # Next best: refresh the pre-opened cart tab in place
+            cart_url = f"{self.base_url}/gp/cart/view.html"
+            cart_window = self._find_cart_window()
+            if cart_window:
+                logging.info("Checkout via pre-opened cart tab")
+                self.driver.switch_to.window(cart_window)
+                # After an earlier checkout the tab may still be on /gp/buy/ - load the cart there instead
+                if "/gp/cart/" in self.driver.current_url:
+                    self.driver.refresh()
+                else:
+                    self.driver.get(cart_url)
+            else:
+                # Navigate to cart first
+                self.driver.get(cart_url)
             
             # Find checkout button
             checkout_btn = WebDriverWait(self.driver, 10).until(
@@ -674,39 +1202,78 @@ class AmazonAutoBuyer:
             logging.error(f"Checkout navigation failed: {str(e)}")
             return False
     
-    def flash_sale_purchase(self, product_name):
-        """ULTRA-FAST purchase for flash sales - OPTIMIZED FOR SPEED."""
+    def flash_sale_purchase(self, product_name, rehearse=False):
+        """ULTRA-FAST purchase for flash sales - OPTIMIZED FOR SPEED.
+
+        With rehearse=True the flow stops once the Add to Cart button is resolved:
+        nothing is clicked, the rehearsal caches are warmed and a go/no-go report
+        is written (see self.rehearsal_report).
+        """
         start_time = time.time()
+        self.phase_timings = {}
+        self.winning_selectors = {}
+        stage = None
+        # Pause session monitors in other processes before touching the browser
+        from session_monitor import clear_sale_mark, mark_sale_started
+        sale_mark = mark_sale_started(self.settings['sale_lock_dir'])
+        self._start_profiler('rehearsal' if rehearse else 'flash_sale')
         try:
-            logging.info(f"FLASH SALE MODE: Starting purchase for '{product_name}'")
+            logging.info(f"FLASH SALE {'REHEARSAL' if rehearse else 'MODE'}: Starting purchase for '{product_name}'")
             
             # Setup browser (should be pre-connected)
-            self.setup_driver()
+            with self._phase('setup'):
+                self.setup_driver()
+            stage = 'setup'
             
             # Quick login check
-            if not self.login_to_amazon():
-                return False
-            
-            # Speed-optimized search
-            if not self.search_product(product_name):
-                return False
+            with self._phase('login'):
+                if not self.login_to_amazon():
+                    return False
+            stage = 'login'
             
-            # Store current search for potential recovery
-            current_search = product_name
+            # A fresh rehearsal already found the product - go straight to its page
+            cached = None if rehearse else self.rehearsal_cache.product(product_name)
+            if cached:
+                logging.info(f"FLASH: Using rehearsed product {cached['asin']}")
+                with self._phase('select'):
+                    fast_path = self.open_product(cached)
+            else:
+                # Render-free search goes straight to the product page; fall back to the rendered path
+                fast_path = self.settings['search_mode'] == 'fetch' and self.search_and_open_product(product_name)
             
-            # Instant product selection  
-            if not self.select_first_product():
-                # If product selection failed due to crash, try to search again
-                logging.warning("Product selection failed, attempting search recovery...")
-                if self.search_product(current_search):
-                    if not self.select_first_product():
+            if not fast_path:
+                # Speed-optimized search
+                with self._phase('search'):
+                    if not self.search_product(product_name):
                         return False
-                else:
-                    return False
+                
+                # Store current search for potential recovery
+                current_search = product_name
+                
+                # Instant product selection  
+                with self._phase('select'):
+                    if not self.select_first_product():
+                        # If product selection failed due to crash, try to search again
+                        logging.warning("Product selection failed, attempting search recovery...")
+                        if self.search_product(current_search):
+                            if not self.select_first_product():
+                                return False
+                        else:
+                            return False
+            stage = 'product'
+            
+            if rehearse:
+                # Resolve the button exactly as the real run would, but never click it
+                with self._phase('add_to_cart'):
+                    self.find_add_to_cart_button(flash_sale_mode=True)
+                stage = 'button'
+                logging.info(f"FLASH SALE REHEARSAL COMPLETED in {time.time() - start_time:.2f} seconds (nothing clicked)")
+                return True
             
             # Lightning-fast add to cart
-            if not self.add_to_cart(flash_sale_mode=True):
-                return False
+            with self._phase('add_to_cart'):
+                if not self.add_to_cart(flash_sale_mode=True):
+                    return False
             
             elapsed = time.time() - start_time
             logging.info(f"FLASH SALE COMPLETED in {elapsed:.2f} seconds!")
@@ -717,32 +1284,54 @@ class AmazonAutoBuyer:
             elapsed = time.time() - start_time
             logging.error(f"FLASH SALE FAILED after {elapsed:.2f} seconds: {str(e)}")
             return False
+        
+        finally:
+            self._stop_profiler()
+            if self.settings['cache_stats'] and self.driver:
+                self.log_cache_stats('flash_sale')
+            clear_sale_mark(sale_mark)
+            if rehearse:
+                try:
+                    self._finish_rehearsal(product_name, stage)
+                except Exception as e:
+                    logging.error(f"REHEARSAL: could not write the report: {e}")
     
     def complete_purchase(self, product_name):
         """Complete the entire purchase process - NORMAL MODE."""
+        self.phase_timings = {}
+        self._start_profiler('complete_purchase')
         try:
             # Setup browser
-            self.setup_driver()
+            with self._phase('setup'):
+                self.setup_driver()
             
             # Login
-            if not self.login_to_amazon():
-                return False
+            with self._phase('login'):
+                if not self.login_to_amazon():
+                    return False
             
-            # Search for product
-            if not self.search_product(product_name):
-                return False
+            fast_path = self.settings['search_mode'] == 'fetch' and self.search_and_open_product(product_name)
             
-            # Select first product
-            if not self.select_first_product():
-                return False
+            if not fast_path:
+                # Search for product
+                with self._phase('search'):
+                    if not self.search_product(product_name):
+                        return False
+                
+                # Select first product
+                with self._phase('select'):
+                    if not self.select_first_product():
+                        return False
             
             # Add to cart
-            if not self.add_to_cart(flash_sale_mode=False):
-                return False
+            with self._phase('add_to_cart'):
+                if not self.add_to_cart(flash_sale_mode=False):
+                    return False
             
             # Proceed to checkout
-            if not self.proceed_to_checkout():
-                return False
+            with self._phase('checkout'):
+                if not self.proceed_to_checkout():
+                    return False
             
             # Note: Actual purchase completion would require payment method selection
             # and final confirmation. This is deliberately left incomplete for safety.
@@ -756,11 +1345,12 @@ class AmazonAutoBuyer:
             return False
         
         finally:
+            self._stop_profiler()
             if self.driver:
                 # Don't close browser if we're reusing an existing session
-                reuse_browser = self.config.get('settings', {}).get('reuse_existing_browser', True)
-                if not reuse_browser:
-                    input("Press Enter to close the browser...")
+                if not self.settings['reuse_existing_browser']:
+                    if self.interactive:
+                        input("Press Enter to close the browser...")
                     self.driver.quit()
                 else:
                     logging.info("Browser session will remain open for reuse")
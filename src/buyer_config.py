@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Buyer Configuration
+Load config/config.json once and precompute the settings the buyer reads.
+
+This module only uses the standard library so command-line entry points can
+parse and validate configuration before paying for any Selenium import.
+"""
+
+import json
+import logging
+
+
+DEFAULT_SETTINGS = {
+    'headless': False,
+    'reuse_existing_browser': True,
+    'debugger_address': '127.0.0.1:9222',
+    'base_url': 'https://www.amazon.in',
+    'launch_profile': 'default',
+    'block_url_patterns': [],
+    'browser_profile': None,
+    'browser_profiles_dir': 'browser_profiles',
+    'browser_cache_mb': 512,
+    'cache_stats': False,
+    'search_mode': 'render',
+    'page_load_strategy': 'normal',
+    'trace_commands': False,
+    'trace_dir': 'logs/traces',
+    'trace_dom_snapshots': True,
+    'diagnostics_dir': 'logs/diagnostics',
+    'diagnostics_max_mb': 50,
+    'session_state_file': 'logs/session_state.json',
+    'health_interval': 30,
+    'health_url': '/robots.txt',
+    'health_thresholds_ms': {},
+    'sale_lock_dir': 'logs/sale_locks',
+    'sale_lock_max_age': 900,
+    'profile_python': False,
+    'profile_dir': 'logs/profile',
+    'profile_interval': 0.005,
+    'rehearsal_cache_file': 'logs/rehearsal_cache.json',
+    'rehearsal_max_age': 3600,
+    'rehearsal_dir': 'logs/rehearsal',
+    'rehearsal_max_fire_ms': 1500,
+}
+
+
+def load_config(config_path):
+    """Load configuration from JSON file."""
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logging.error(f"Config file not found: {config_path}")
+        return {}
+
+
+def resolve_settings(config, overrides=None):
+    """Merge defaults, config settings and overrides into one flat settings dict."""
+    settings = dict(DEFAULT_SETTINGS)
+    # Older configs put headless at the top level instead of under settings
+    if 'headless' in config:
+        settings['headless'] = config['headless']
+    settings.update(config.get('settings', {}))
+    settings.update(overrides or {})
+    settings['base_url'] = settings['base_url'].rstrip('/')
+    return settings
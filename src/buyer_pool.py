@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Buyer Process Pool
+Run independent AmazonAutoBuyer workers in parallel processes.
+
+Each worker process owns its own Chrome instance, debug port and user data
+directory, so neither the Selenium client nor the browser is shared. Targets
+are handed out over a task queue and results (outcome plus phase timings) come
+back to the supervisor over a result queue.
+"""
+
+import os
+import time
+import queue
+import logging
+import multiprocessing
+
+
+def _worker_main(worker_id, port, user_data_dir, config_path, settings, task_queue, result_queue):
+    """Worker process: launch a private Chrome, then buy targets until told to stop."""
+    from amazon_buyer import AmazonAutoBuyer
+    from chrome_launcher import launch_chrome, stop_chrome, DENSE_PROFILE_ARGUMENTS
+
+    chrome = None
+    buyer = None
+    try:
+        startup_start = time.perf_counter()
+        worker_settings = dict(settings)
+        worker_settings.update({
+            'reuse_existing_browser': True,
+            'debugger_address': f"127.0.0.1:{port}",
+            # The worker's Chrome has its own user data dir; a fallback launch must not take the shared profile
+            'browser_profile': None,
+        })
+        buyer = AmazonAutoBuyer(config_path, settings=worker_settings)
+        dense = buyer.settings['launch_profile'] == 'dense'
+        chrome = launch_chrome(
+            port, user_data_dir,
+            headless=dense or buyer.settings['headless'],
+            extra_args=DENSE_PROFILE_ARGUMENTS if dense else (),
+            binary=buyer.settings.get('chrome_binary')
+        )
+        buyer.setup_driver()
+        result_queue.put({
+            'type': 'ready', 'worker': worker_id, 'port': port,
+            'startup': round(time.perf_counter() - startup_start, 3)
+        })
+
+        while True:
+            target = task_queue.get()
+            if target is None:
+                break
+            start_time = time.perf_counter()
+            success = buyer.flash_sale_purchase(target)
+            result_queue.put({
+                'type': 'result', 'worker': worker_id, 'target': target, 'success': success,
+                'elapsed': round(time.perf_counter() - start_time, 3),
+                'phases': dict(buyer.phase_timings),
+            })
+
+    except Exception as e:
+        logging.error(f"Worker {worker_id} failed: {e}")
+        result_queue.put({'type': 'error', 'worker': worker_id, 'error': str(e)})
+
+    finally:
+        if buyer and buyer.driver:
+            try:
+                buyer.driver.quit()
+            except Exception:
+                pass
+        if chrome:
+            stop_chrome(chrome)
+        result_queue.put({'type': 'done', 'worker': worker_id})
+
+
+class BuyerSupervisor:
+    def __init__(self, targets, workers=None, config_path='config/config.json',
+                 profile_root='/tmp/amazon-buyer-workers', settings=None):
+        """Initialize the supervisor with product targets and a worker count."""
+        self.targets = list(targets)
+        self.workers = workers or len(self.targets)
+        self.config_path = config_path
+        self.profile_root = profile_root
+        self.settings = settings or {}
+
+    def run(self, timeout=300):
+        """Run every target across the worker pool and collect results and timings."""
+        from chrome_launcher import free_port
+
+        context = multiprocessing.get_context('spawn')
+        task_queue = context.Queue()
+        result_queue = context.Queue()
+
+        for target in self.targets:
+            task_queue.put(target)
+        for _ in range(self.workers):
+            task_queue.put(None)
+
+        start_time = time.perf_counter()
+        processes = {}
+        for worker_id in range(self.workers):
+            # Profiles are kept per worker slot so a logged-in worker stays logged in
+            user_data_dir = os.path.join(self.profile_root, f"worker-{worker_id}")
+            process = context.Process(
+                target=_worker_main,
+                args=(worker_id, free_port(), user_data_dir, self.config_path,
+                      self.settings, task_queue, result_queue),
+                name=f"buyer-worker-{worker_id}"
+            )
+            process.start()
+            processes[worker_id] = process
+
+        report = {'results': [], 'workers': {}, 'errors': []}
+        finished = set()
+        deadline = time.time() + timeout
+        while len(finished) < self.workers and time.time() < deadline:
+            try:
+                message = result_queue.get(timeout=0.5)
+            except queue.Empty:
+                # A worker that died without saying goodbye will never finish
+                for worker_id, process in processes.items():
+                    if worker_id not in finished and not process.is_alive():
+                        report['errors'].append({'worker': worker_id, 'error': f"exited with {process.exitcode}"})
+                        finished.add(worker_id)
+                continue
+
+            if message['type'] == 'ready':
+                report['workers'][message['worker']] = {'port': message['port'], 'startup': message['startup']}
+                logging.info(f"SUPERVISOR: worker {message['worker']} ready on port {message['port']}")
+            elif message['type'] == 'result':
+                report['results'].append(message)
+            elif message['type'] == 'error':
+                report['errors'].append(message)
+            elif message['type'] == 'done':
+                finished.add(message['worker'])
+
+        for process in processes.values():
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        report['elapsed'] = round(time.perf_counter() - start_time, 3)
+        return report
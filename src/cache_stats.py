@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cache Statistics
+Browser HTTP cache hit/miss counts for the pages a session has loaded.
+
+The primary source is Chrome's performance log, which carries the DevTools
+Network events (responseReceived, requestServedFromCache, loadingFinished).
+It needs the goog:loggingPrefs capability, set by enable_network_log(). When
+the log is not available, for example on a session attached without that
+capability, the Resource Timing API is used instead. There, a resource with a
+body but no transfer size was served from cache.
+
+Each call to collect() covers the requests since the previous call.
+"""
+
+import json
+import logging
+from collections import defaultdict
+
+
+STATIC_TYPES = ('Script', 'Stylesheet', 'Image', 'Font')
+
+# Resource Timing initiator types mapped onto DevTools resource types
+INITIATOR_TYPES = {'script': 'Script', 'link': 'Stylesheet', 'css': 'Stylesheet', 'img': 'Image'}
+
+RESOURCE_TIMING_SCRIPT = """
+var entries = performance.getEntriesByType('resource').map(function (entry) {
+    return {url: entry.name, initiator: entry.initiatorType,
+            transfer: entry.transferSize, body: entry.decodedBodySize};
+});
+performance.clearResourceTimings();
+return entries;
+"""
+
+
+def enable_network_log(options):
+    """Ask chromedriver to record DevTools Network events in the performance log."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def _from_network_log(driver):
+    """Build per-request records from DevTools Network events in the performance log."""
+    requests = defaultdict(lambda: {'cached': False, 'bytes': 0, 'type': 'Other', 'url': None})
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        method, params = message['method'], message.get('params', {})
+        if method == 'Network.responseReceived':
+            record = requests[params['requestId']]
+            response = params['response']
+            record['type'] = params.get('type', 'Other')
+            record['url'] = response.get('url')
+            if response.get('fromDiskCache') or response.get('fromPrefetchCache'):
+                record['cached'] = True
+        elif method == 'Network.requestServedFromCache':
+            requests[params['requestId']]['cached'] = True
+        elif method == 'Network.loadingFinished':
+            requests[params['requestId']]['bytes'] = params.get('encodedDataLength', 0)
+    return [record for record in requests.values() if record['url']]
+
+
+def _from_resource_timing(driver):
+    """Build per-request records from the Resource Timing API."""
+    records = []
+    for entry in driver.execute_script(RESOURCE_TIMING_SCRIPT) or []:
+        # Cross-origin entries without Timing-Allow-Origin report zero for both sizes
+        if not entry['body'] and not entry['transfer']:
+            continue
+        records.append({
+            'url': entry['url'],
+            'type': INITIATOR_TYPES.get(entry['initiator'], 'Other'),
+            'cached': entry['transfer'] == 0,
+            'bytes': entry['transfer'],
+        })
+    return records
+
+
+def collect(driver):
+    """Summarise cache hits and misses for requests since the last call."""
+    source = 'network'
+    try:
+        records = _from_network_log(driver)
+    except Exception as e:
+        logging.debug(f"Performance log unavailable ({e}), using resource timing")
+        records = None
+    if not records:
+        source = 'resource-timing'
+        records = _from_resource_timing(driver)
+
+    by_type = defaultdict(lambda: {'hits': 0, 'misses': 0})
+    for record in records:
+        by_type[record['type']]['hits' if record['cached'] else 'misses'] += 1
+
+    static = [record for record in records if record['type'] in STATIC_TYPES]
+    hits = sum(1 for record in static if record['cached'])
+    return {
+        'source': source,
+        'requests': len(records),
+        'static_requests': len(static),
+        'static_hits': hits,
+        'static_hit_rate': round(hits / len(static), 3) if static else None,
+        'bytes_transferred': sum(record['bytes'] for record in records),
+        'by_type': dict(by_type),
+    }
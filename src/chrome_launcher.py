@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chrome Launcher
+Start Chrome instances with remote debugging, one debug port and profile each.
+
+This is the Python counterpart of start_chrome_debug.sh, generalised so that
+several independent browsers can run side by side.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import subprocess
+import urllib.request
+
+
+MAC_CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+WINDOWS_CHROME = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+LINUX_CHROME_NAMES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+
+DEBUG_ARGUMENTS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-background-networking',
+    '--disable-features=VizDisplayCompositor',
+]
+
+# Low-memory launch profile for packing many sessions onto one host
+DENSE_PROFILE_ARGUMENTS = [
+    '--renderer-process-limit=2',
+    '--process-per-site',
+    '--disk-cache-size=33554432',
+    '--media-cache-size=1048576',
+    '--aggressive-cache-discard',
+    '--disable-back-forward-cache',
+    '--js-flags=--max-old-space-size=256',
+]
+
+
+def browser_profile_dir(profiles_dir, name):
+    """Absolute user data directory of a managed browser profile."""
+    return os.path.abspath(os.path.join(profiles_dir, name))
+
+
+def profile_arguments(profile_dir, cache_mb=512):
+    """Chrome switches for a persistent profile whose disk cache survives between sessions."""
+    return [
+        f'--user-data-dir={profile_dir}',
+        f'--disk-cache-dir={os.path.join(profile_dir, "DiskCache")}',
+        f'--disk-cache-size={cache_mb * 1024 * 1024}',
+    ]
+
+
+def find_chrome_binary(configured=None):
+    """Locate the Chrome executable from config, CHROME_BINARY or platform defaults."""
+    candidates = [configured, os.environ.get('CHROME_BINARY')]
+    if sys.platform == 'darwin':
+        candidates.append(MAC_CHROME)
+    elif sys.platform.startswith('win'):
+        candidates.append(WINDOWS_CHROME)
+    else:
+        candidates.extend(shutil.which(name) for name in LINUX_CHROME_NAMES)
+
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError("Chrome executable not found; set settings.chrome_binary or CHROME_BINARY")
+
+
+def free_port():
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def debugger_ready(port):
+    """Return True if a Chrome DevTools endpoint answers on the port."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=0.5) as response:
+            return 'webSocketDebuggerUrl' in json.load(response)
+    except (OSError, ValueError):
+        return False
+
+
+def launch_chrome(port, user_data_dir, url=None, headless=False, extra_args=(), binary=None, timeout=15):
+    """Start Chrome with remote debugging on a port and wait until it accepts connections."""
+    os.makedirs(user_data_dir, exist_ok=True)
+    command = [
+        find_chrome_binary(binary),
+        f'--remote-debugging-port={port}',
+        f'--user-data-dir={user_data_dir}',
+    ] + DEBUG_ARGUMENTS + list(extra_args)
+    if headless:
+        command.append('--headless=new')
+    if url:
+        command.append(url)
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if debugger_ready(port):
+            return process
+        if process.poll() is not None:
+            raise RuntimeError(f"Chrome exited with code {process.returncode} before opening port {port}")
+        time.sleep(0.1)
+
+    process.terminate()
+    raise TimeoutError(f"Chrome did not open debug port {port} within {timeout}s")
+
+
+def stop_chrome(process, timeout=5):
+    """Terminate a Chrome process started by launch_chrome."""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Command Trace Recording and Replay
+Capture every WebDriver command issued by AmazonAutoBuyer and replay it offline.
+
+Recording wraps the driver's command executor, so every Selenium call (find,
+click, execute_script, navigation...) is written to a JSON-lines trace with its
+raw response, latency and, after page-changing commands, a DOM snapshot.
+
+Replay feeds a trace back through a simulated driver that answers commands from
+the recording, sleeping for the recorded latency. Commands the recording never
+saw (a new selector order, a different wait strategy) are answered from the
+nearest DOM snapshot, so a modified buyer can be timed without a live browser.
+"""
+
+import os
+import json
+import time
+import logging
+import statistics
+from urllib.parse import urljoin, urlsplit
+from bs4 import BeautifulSoup
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+
+# W3C element reference key used in raw wire responses
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Commands after which the page (or the window being driven) may have changed
+SNAPSHOT_COMMANDS = {
+    "get", "clickElement", "refresh", "goBack", "goForward",
+    "switchToWindow", "newWindow", "elementSendKeys"
+}
+
+SNAPSHOT_SCRIPT = "return [document.location.href, document.documentElement.outerHTML];"
+
+# Selenium 4 runs get_attribute() and is_displayed() as injected atoms marked with these comments
+GET_ATTRIBUTE_ATOM = "/* getAttribute */"
+IS_DISPLAYED_ATOM = "/* isDisplayed */"
+
+# Attributes the getAttribute atom reports as "true" when present, None otherwise
+BOOLEAN_ATTRIBUTES = {
+    "async", "autofocus", "checked", "defer", "disabled", "hidden", "multiple",
+    "readonly", "required", "selected"
+}
+
+
+def _command_key(command, params):
+    """Build a stable lookup key for a command and its parameters."""
+    params = dict(params or {})
+    params.pop("sessionId", None)
+    return command + " " + json.dumps(params, sort_keys=True, default=str)
+
+
+def _same_page(url, other):
+    """True if two URLs name the same page (ignoring fragments, ref paths and tracking query)."""
+    if not url or not other:
+        return False
+    a, b = urlsplit(url), urlsplit(other)
+    if (a.netloc, a.path.rstrip('/'), a.query) == (b.netloc, b.path.rstrip('/'), b.query):
+        return True
+    # Product links carry /ref=... suffixes and tracking parameters; the ASIN identifies the page
+    for marker in ("/dp/", "/gp/product/"):
+        if marker in a.path and marker in b.path:
+            return a.path.split(marker)[1][:10] == b.path.split(marker)[1][:10]
+    # Search pages are identified by their query
+    if a.path.rstrip('/') == b.path.rstrip('/') == "/s":
+        return a.query.split("&")[0] == b.query.split("&")[0]
+    return False
+
+
+def load_trace(trace_path):
+    """Load a JSON-lines trace file into a list of entries."""
+    entries = []
+    with open(trace_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+class TraceRecorder:
+    """Command executor wrapper that records every WebDriver command."""
+
+    def __init__(self, executor, trace_path, snapshot_dom=True):
+        self.executor = executor
+        self.trace_path = trace_path
+        self.snapshot_dom = snapshot_dom
+        self.session_id = None
+        self.seq = 0
+        self.started = time.perf_counter()
+        self.snapshot_time = 0.0
+        os.makedirs(os.path.dirname(trace_path) or '.', exist_ok=True)
+        self._file = open(trace_path, 'a')
+
+    @classmethod
+    def attach(cls, driver, trace_path, snapshot_dom=True):
+        """Start recording all commands issued through an existing driver."""
+        recorder = cls(driver.command_executor, trace_path, snapshot_dom)
+        recorder.session_id = driver.session_id
+        driver.command_executor = recorder
+        logging.info(f"Recording WebDriver commands to {trace_path}")
+        return recorder
+
+    def __getattr__(self, name):
+        # Everything except execute() is delegated to the real executor
+        return getattr(self.executor, name)
+
+    def execute(self, command, params):
+        """Forward a command to the real executor and record the outcome."""
+        # Offsets exclude time spent taking our own DOM snapshots
+        offset = time.perf_counter() - self.started - self.snapshot_time
+        start = time.perf_counter()
+        try:
+            response = self.executor.execute(command, params)
+        except Exception as e:
+            self._write(command, params, None, time.perf_counter() - start, offset, error=str(e))
+            raise
+        elapsed = time.perf_counter() - start
+
+        if command == "newSession" and response:
+            value = response.get("value") or {}
+            self.session_id = value.get("sessionId", self.session_id)
+
+        dom = None
+        if self.snapshot_dom and command in SNAPSHOT_COMMANDS and not self._is_error(response):
+            snapshot_start = time.perf_counter()
+            dom = self._snapshot()
+            self.snapshot_time += time.perf_counter() - snapshot_start
+
+        self._write(command, params, response, elapsed, offset, dom=dom)
+        return response
+
+    def close(self):
+        """Flush and close the trace file, then close the wrapped executor."""
+        if not self._file.closed:
+            self._file.close()
+        self.executor.close()
+
+    @staticmethod
+    def _is_error(response):
+        value = (response or {}).get("value")
+        return isinstance(value, dict) and "error" in value
+
+    def _snapshot(self):
+        """Capture the current URL and DOM without recording the snapshot command."""
+        try:
+            response = self.executor.execute(
+                "w3cExecuteScript",
+                {"script": SNAPSHOT_SCRIPT, "args": [], "sessionId": self.session_id}
+            )
+            url, html = response.get("value") or [None, None]
+            return {"url": url, "html": html}
+        except Exception as e:
+            logging.debug(f"DOM snapshot failed: {e}")
+            return None
+
+    def _write(self, command, params, response, elapsed, offset, error=None, dom=None):
+        self.seq += 1
+        params = dict(params or {})
+        params.pop("sessionId", None)
+        entry = {
+            "seq": self.seq,
+            "command": command,
+            "params": params,
+            "response": response,
+            "elapsed": round(elapsed, 6),
+            "offset": round(offset, 6),
+        }
+        if error:
+            entry["error"] = error
+        if dom:
+            entry["dom"] = dom
+        self._file.write(json.dumps(entry, default=str) + "\n")
+        self._file.flush()
+
+
+class ReplayExecutor:
+    """Simulated command executor that answers from a recorded trace."""
+
+    def __init__(self, entries, simulate_latency=True):
+        self.simulate_latency = simulate_latency
+        self.responses = {}
+        self.latencies = {}
+        self.command_count = 0
+        self.matched = 0
+        self.simulated = 0
+        self.simulated_wait = 0.0
+        self.snapshot = None
+        self.snapshots = []
+        self._synthetic = {}
+
+        for entry in entries:
+            if entry.get("response") is None and not entry.get("error"):
+                continue
+            key = _command_key(entry["command"], entry.get("params"))
+            self.responses.setdefault(key, []).append(entry)
+            self.latencies.setdefault(entry["command"], []).append(entry["elapsed"])
+            if entry.get("dom"):
+                entry["dom"]["_index"] = len(self.snapshots)
+                self.snapshots.append(entry["dom"])
+        self.snapshot = self.snapshots[0] if self.snapshots else None
+
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        self.default_latency = statistics.median(all_latencies) if all_latencies else 0.0
+
+    def execute(self, command, params):
+        """Answer a command from the trace, falling back to the DOM snapshot."""
+        self.command_count += 1
+        key = _command_key(command, params)
+        queue = self.responses.get(key)
+
+        if queue:
+            # Serve recordings in order; keep repeating the last one for polling loops
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+            self.matched += 1
+            self._sleep(entry["elapsed"])
+            if entry.get("dom"):
+                self.snapshot = entry["dom"]
+            if entry.get("error"):
+                raise ConnectionError(entry["error"])
+            return json.loads(json.dumps(entry["response"]))
+
+        self.simulated += 1
+        latencies = self.latencies.get(command)
+        self._sleep(statistics.median(latencies) if latencies else self.default_latency)
+        return self._simulate(command, dict(params or {}))
+
+    def close(self):
+        """Nothing to release; present so ReplayDriver.quit() works."""
+
+    def _navigate(self, url):
+        """Move to the next recorded snapshot of a page, as a simulated get or click would."""
+        if not url:
+            return
+        start = self.snapshot["_index"] + 1 if self.snapshot else 0
+        # Prefer the next visit after the current page, then any earlier visit
+        for snapshot in self.snapshots[start:] + self.snapshots[:start]:
+            if _same_page(url, snapshot.get("url")):
+                self.snapshot = snapshot
+                return
+        logging.debug(f"Replay: no recorded snapshot for {url}, staying on current page")
+
+    def _link_target(self, tag):
+        """Absolute href of a clicked element or the link around it."""
+        link = tag if tag.name == "a" else tag.find_parent("a")
+        if link is None or not link.get("href"):
+            return None
+        return urljoin((self.snapshot or {}).get("url", ""), link["href"])
+
+    def _attribute(self, tag, name):
+        """Emulate the getAttribute atom (property first, then attribute) on a snapshot tag."""
+        if name in BOOLEAN_ATTRIBUTES:
+            return "true" if tag.has_attr(name) else None
+        value = tag.get(name)
+        if name == "value" and value is None and tag.name in ("button", "option", "textarea"):
+            value = tag.get_text()
+        if isinstance(value, list):
+            value = " ".join(value)
+        if name in ("href", "src") and value is not None:
+            value = urljoin((self.snapshot or {}).get("url", ""), value)
+        return value
+
+    @staticmethod
+    def _displayed(tag):
+        """Approximate the isDisplayed atom from markup alone."""
+        if tag.name == "input" and (tag.get("type") or "").lower() == "hidden":
+            return False
+        node = tag
+        while node is not None and node.name != "[document]":
+            style = (node.get("style") or "").replace(" ", "").lower()
+            if node.has_attr("hidden") or "display:none" in style or "visibility:hidden" in style:
+                return False
+            node = node.parent
+        return True
+
+    def _sleep(self, seconds):
+        self.simulated_wait += seconds
+        if self.simulate_latency and seconds > 0:
+            time.sleep(seconds)
+
+    def _soup(self):
+        if not self.snapshot or not self.snapshot.get("html"):
+            return None
+        if self.snapshot.get("_soup") is None:
+            self.snapshot["_soup"] = BeautifulSoup(self.snapshot["html"], "html.parser")
+        return self.snapshot["_soup"]
+
+    def _find(self, params):
+        """Resolve a CSS/ID/name/tag lookup against the current DOM snapshot."""
+        soup = self._soup()
+        if soup is None:
+            return []
+        using, value = params.get("using"), params.get("value", "")
+        try:
+            if using == "css selector":
+                return soup.select(value)
+            if using == "tag name":
+                return soup.find_all(value)
+        except Exception:
+            return []
+        return []
+
+    def _element(self, tag):
+        element_id = f"replay-{id(tag)}"
+        self._synthetic[element_id] = tag
+        return {ELEMENT_KEY: element_id}
+
+    def _simulate(self, command, params):
+        """Produce a plausible response for a command absent from the trace."""
+        if command == "newSession":
+            return {"value": {"sessionId": "replay-session", "capabilities": {"browserName": "chrome"}}}
+
+        if command in ("findElement", "findElements"):
+            matches = self._find(params)
+            if command == "findElements":
+                return {"value": [self._element(tag) for tag in matches]}
+            if matches:
+                return {"value": self._element(matches[0])}
+            # Same shape as RemoteConnection: ErrorHandler only reads the error code from a JSON string
+            return {"status": 404, "value": json.dumps({"value": {
+                "error": "no such element",
+                "message": f"Replay: no match for {params.get('value')} in snapshot",
+                "stacktrace": ""
+            }})}
+
+        if command == "getCurrentUrl":
+            return {"value": (self.snapshot or {}).get("url", "")}
+
+        if command == "get":
+            self._navigate(params.get("url"))
+            return {"value": None}
+
+        tag = self._synthetic.get(params.get("id"))
+        if tag is not None:
+            if command == "getElementText":
+                return {"value": tag.get_text(" ", strip=True)}
+            if command in ("getElementAttribute", "getElementProperty"):
+                return {"value": self._attribute(tag, params.get("name"))}
+            if command == "isElementEnabled":
+                return {"value": not tag.has_attr("disabled")}
+            if command == "isElementDisplayed":
+                return {"value": self._displayed(tag)}
+            if command == "clickElement":
+                self._navigate(self._link_target(tag))
+                return {"value": None}
+
+        if command in ("w3cExecuteScript", "w3cExecuteScriptAsync"):
+            script, args = params.get("script", ""), params.get("args", [])
+            element = args[0].get(ELEMENT_KEY) if args and isinstance(args[0], dict) else None
+            tag = self._synthetic.get(element)
+            if tag is not None:
+                # Selenium's own atoms and a plain JS click are evaluated against the snapshot tag
+                if script.startswith(GET_ATTRIBUTE_ATOM):
+                    return {"value": self._attribute(tag, args[1])}
+                if script.startswith(IS_DISPLAYED_ATOM):
+                    return {"value": self._displayed(tag)}
+                if ".click()" in script:
+                    self._navigate(self._link_target(tag))
+
+        return {"value": None}
+
+    def report(self):
+        """Summarise how the replayed run used the trace."""
+        return {
+            "commands": self.command_count,
+            "matched": self.matched,
+            "simulated": self.simulated,
+            "simulated_browser_time": round(self.simulated_wait, 3),
+        }
+
+
+class ReplayDriver(RemoteWebDriver):
+    """WebDriver that runs against a recorded trace instead of a browser."""
+
+    def __init__(self, trace_path, simulate_latency=True):
+        self.replay = ReplayExecutor(load_trace(trace_path), simulate_latency)
+        super().__init__(command_executor=self.replay, options=Options())
+
+
+def summarize_trace(trace_path):
+    """Summarise a recorded live run for comparison with a replay."""
+    entries = load_trace(trace_path)
+    if not entries:
+        return {"commands": 0, "duration": 0.0, "browser_time": 0.0}
+    last = entries[-1]
+    return {
+        "commands": len(entries),
+        "duration": round(last["offset"] + last["elapsed"], 3),
+        "browser_time": round(sum(entry["elapsed"] for entry in entries), 3),
+    }
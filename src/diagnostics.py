@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Failure Diagnostics Capture
+Grab a screenshot, DOM snapshot, URL and recent log records in one cheap call.
+
+Only the browser round trips happen on the caller's thread. Decoding, gzip
+compression and disk writes run on a background worker, and the diagnostics
+directory is pruned oldest-first so it never grows past a size cap.
+"""
+
+import os
+import json
+import gzip
+import time
+import queue
+import atexit
+import base64
+import shutil
+import logging
+import threading
+from collections import deque
+
+
+DOM_SCRIPT = "return [document.location.href, document.documentElement.outerHTML];"
+
+
+class RecentLogHandler(logging.Handler):
+    """Logging handler that keeps the most recent formatted records in memory."""
+
+    def __init__(self, capacity=50):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class DiagnosticsCapture:
+    def __init__(self, log_handler, directory='logs/diagnostics', max_bytes=50 * 1024 * 1024):
+        """Start the background writer; log_handler supplies the recent log records."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.log_handler = log_handler
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="diagnostics-writer", daemon=True)
+        self._worker.start()
+        atexit.register(self.flush)
+
+    def capture(self, driver, tag):
+        """Collect diagnostics from the browser and queue them for writing."""
+        bundle = {
+            'tag': tag,
+            'time': time.time(),
+            'logs': list(self.log_handler.records),
+        }
+
+        # Compressed JPEG straight from DevTools; plain PNG screenshot otherwise
+        try:
+            if hasattr(driver, 'execute_cdp_cmd'):
+                shot = driver.execute_cdp_cmd('Page.captureScreenshot', {'format': 'jpeg', 'quality': 50})
+                bundle['screenshot'], bundle['screenshot_ext'] = shot['data'], 'jpg'
+            else:
+                bundle['screenshot'], bundle['screenshot_ext'] = driver.get_screenshot_as_base64(), 'png'
+        except Exception as e:
+            bundle['errors'] = [f"screenshot: {e}"]
+
+        try:
+            bundle['url'], bundle['dom'] = driver.execute_script(DOM_SCRIPT)
+        except Exception as e:
+            bundle.setdefault('errors', []).append(f"dom: {e}")
+
+        self._queue.put(bundle)
+        logging.info(f"Diagnostics queued for {self.directory}: {tag}")
+
+    def flush(self, timeout=5):
+        """Wait (bounded) for queued diagnostics to reach disk."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _run(self):
+        while True:
+            bundle = self._queue.get()
+            try:
+                self._write(bundle)
+                self._prune()
+            except Exception as e:
+                logging.warning(f"Diagnostics write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, bundle):
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(bundle['time']))
+        millis = int(bundle['time'] * 1000) % 1000
+        path = os.path.join(self.directory, f"{stamp}_{millis:03d}_{bundle['tag']}")
+        os.makedirs(path, exist_ok=True)
+
+        if bundle.get('screenshot'):
+            with open(os.path.join(path, f"screenshot.{bundle['screenshot_ext']}"), 'wb') as f:
+                f.write(base64.b64decode(bundle['screenshot']))
+
+        if bundle.get('dom'):
+            with gzip.open(os.path.join(path, 'dom.html.gz'), 'wt', encoding='utf-8') as f:
+                f.write(bundle['dom'])
+
+        info = {
+            'tag': bundle['tag'],
+            'time': bundle['time'],
+            'url': bundle.get('url'),
+            'errors': bundle.get('errors', []),
+            'logs': bundle['logs'],
+        }
+        with open(os.path.join(path, 'info.json'), 'w') as f:
+            json.dump(info, f, indent=2)
+
+    def _prune(self):
+        """Delete the oldest bundles until the directory fits under the size cap."""
+        bundles = []
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            bundles.append((os.path.getmtime(path), path, size))
+            total += size
+
+        for _, path, size in sorted(bundles):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Phase Profiler
+Sampling profiler for the buyer's own Python overhead, scoped per purchase phase.
+
+A background thread samples the purchase thread's stack every few milliseconds
+and files each sample under the current phase. Samples are classified as:
+  - browser: blocked inside Selenium's HTTP round trip to chromedriver
+  - sleep:   parked in a sleep (WebDriverWait polling, fixed waits)
+  - python:  everything else - the client-side overhead we want to see
+
+Per phase, collapsed stacks (flamegraph.pl / speedscope format) are written to
+logs/profile/<run>/<phase>.collapsed, alongside a summary of the top Python
+hotspots.
+"""
+
+import os
+import sys
+import time
+import json
+import logging
+import linecache
+import threading
+from collections import Counter, defaultdict
+
+
+BROWSER_FILES = ('remote_connection.py',)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _classify(frame):
+    """Classify a sample by where the sampled thread currently is."""
+    leaf = frame
+    while frame is not None:
+        if frame.f_code.co_filename.endswith(BROWSER_FILES):
+            return 'browser'
+        frame = frame.f_back
+    if 'sleep(' in linecache.getline(leaf.f_code.co_filename, leaf.f_lineno):
+        return 'sleep'
+    return 'python'
+
+
+class PhaseProfiler:
+    def __init__(self, output_dir='logs/profile', interval=0.005):
+        """Initialize the profiler; nothing is sampled until start()."""
+        self.output_dir = output_dir
+        self.interval = interval
+        self.run_dir = None
+        self.stacks = defaultdict(Counter)
+        self.kinds = defaultdict(Counter)
+        self.leaves = defaultdict(Counter)
+        self.counts = Counter()
+        self._phases = []
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self, run_name):
+        """Start sampling the calling thread."""
+        self.run_dir = os.path.join(self.output_dir, f"{run_name}_{time.strftime('%Y%m%d_%H%M%S')}")
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="phase-profiler", daemon=True)
+        self._sampler.start()
+
+    def enter(self, phase):
+        """Attribute subsequent samples to a phase."""
+        self._phases.append(phase)
+
+    def exit(self):
+        """Return to the enclosing phase."""
+        if self._phases:
+            self._phases.pop()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # Weight each sample by real elapsed time, since waits overshoot the interval
+            now = time.perf_counter()
+            weight, last = now - last, now
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            phase = self._phases[-1] if self._phases else 'other'
+            kind = _classify(frame)
+            self.kinds[phase][kind] += weight
+            self.counts[phase] += 1
+            if kind == 'python':
+                self.leaves[phase][_frame_label(frame)] += weight
+
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[phase][';'.join(reversed(labels))] += 1
+
+    def stop(self, top=10):
+        """Stop sampling, write per-phase collapsed stacks and return the summary."""
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        summary = {}
+        for phase, stacks in self.stacks.items():
+            with open(os.path.join(self.run_dir, f"{phase}.collapsed"), 'w') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+            kinds = self.kinds[phase]
+            summary[phase] = {
+                'samples': self.counts[phase],
+                'python_ms': round(kinds['python'] * 1000, 1),
+                'browser_ms': round(kinds['browser'] * 1000, 1),
+                'sleep_ms': round(kinds['sleep'] * 1000, 1),
+                'hotspots': [
+                    {'function': label, 'ms': round(seconds * 1000, 1)}
+                    for label, seconds in self.leaves[phase].most_common(top)
+                ],
+            }
+
+        with open(os.path.join(self.run_dir, 'summary.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+        self._log_summary(summary)
+        return summary
+
+    def _log_summary(self, summary):
+        logging.info(f"PROFILE: written to {self.run_dir}")
+        for phase, stats in summary.items():
+            logging.info(
+                f"PROFILE [{phase}]: python {stats['python_ms']}ms, "
+                f"waiting on browser {stats['browser_ms']}ms, sleeping {stats['sleep_ms']}ms"
+            )
+            for hotspot in stats['hotspots'][:5]:
+                logging.info(f"PROFILE [{phase}]:   {hotspot['ms']:>7}ms  {hotspot['function']}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Rehearsal
+Selector-ranking and ASIN caches warmed by a pre-sale dry run, and the
+go/no-go report that dry run produces.
+
+A rehearsal runs the flash sale flow up to (but not including) the Add to Cart
+click. The selectors that won and the product it landed on are cached, so the
+real run tries the winning selectors first and opens the product page directly
+instead of searching again.
+"""
+
+import os
+import json
+import time
+import logging
+
+
+class RehearsalCache:
+    def __init__(self, path='logs/rehearsal_cache.json', max_age=3600):
+        """Initialize the cache; entries older than max_age seconds are ignored."""
+        self.path = path
+        self.max_age = max_age
+        self.data = None
+
+    def _load(self):
+        if self.data is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self.data = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.data = {}
+            self.data.setdefault('selectors', {})
+            self.data.setdefault('products', {})
+        return self.data
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry.get('saved_at', 0) <= self.max_age
+
+    def rank(self, kind, selectors):
+        """Return selectors with the cached winner for this kind moved to the front."""
+        entry = self._load()['selectors'].get(kind)
+        if not self._fresh(entry) or entry['selector'] not in selectors:
+            return selectors
+        return [entry['selector']] + [selector for selector in selectors if selector != entry['selector']]
+
+    def product(self, product_name):
+        """Return the cached product record (asin, href, title) for a search, if fresh."""
+        entry = self._load()['products'].get(product_name.strip().lower())
+        return entry if self._fresh(entry) else None
+
+    def remember(self, product_name, product, selectors):
+        """Store a rehearsal's product and winning selectors and write the cache to disk."""
+        data = self._load()
+        now = time.time()
+        if product:
+            data['products'][product_name.strip().lower()] = dict(product, saved_at=now)
+        for kind, selector in selectors.items():
+            if selector:
+                data['selectors'][kind] = {'selector': selector, 'saved_at': now}
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+STAGES = ('setup', 'login', 'product', 'button')
+
+
+def build_report(product_name, stage, product, phase_timings, selectors, warm_timings, max_fire_ms,
+                 pre_sale_timings=None):
+    """Turn a rehearsal's measurements into a go/no-go report; stage is the last step that succeeded.
+
+    warm_timings covers only the fire path after the sale starts (open the
+    product, resolve the button, click), which is what max_fire_ms limits.
+    pre_sale_timings (setup, login) are reported separately, since they can
+    be done before the sale.
+    """
+    reached = STAGES.index(stage) if stage in STAGES else -1
+    button = selectors.get('add_to_cart') if reached >= 3 else None
+    fire_ms = round(sum(warm_timings.values()) * 1000, 1)
+    pre_sale_timings = pre_sale_timings or {}
+    checks = [
+        ('login', reached >= 1, "logged in" if reached >= 1 else "setup or login failed"),
+        ('product', reached >= 2 and bool(product), f"product page {product['asin'] if product else 'not reached'}"),
+        ('add_to_cart', bool(button), f"button via {button}" if button else "no Add to Cart button"),
+        ('selector_route', bool(button) and button not in ('flash-instant', 'text-based fallback'),
+         "button found without text fallbacks"),
+        ('fire_latency', bool(button) and fire_ms <= max_fire_ms, f"expected fire {fire_ms}ms (limit {max_fire_ms}ms)"),
+    ]
+    return {
+        'target': product_name,
+        'verdict': 'GO' if all(ok for _, ok, _ in checks) else 'NO-GO',
+        'expected_fire_ms': fire_ms,
+        'pre_sale_ms': round(sum(pre_sale_timings.values()) * 1000, 1),
+        'pre_sale': {phase: round(seconds, 3) for phase, seconds in pre_sale_timings.items()},
+        'product': product,
+        'phases': phase_timings,
+        'warm': {phase: round(seconds, 3) for phase, seconds in warm_timings.items()},
+        'selectors': selectors,
+        'checks': [{'check': name, 'ok': ok, 'detail': detail} for name, ok, detail in checks],
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def write_report(report, directory='logs/rehearsal'):
+    """Write the report as JSON and log a readable summary; returns the file path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"rehearsal_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    logging.info(f"REHEARSAL {report['verdict']}: {report['target']} - expected fire {report['expected_fire_ms']}ms "
+                 f"(setup and login before the sale: {report['pre_sale_ms']}ms)")
+    for check in report['checks']:
+        logging.info(f"REHEARSAL   [{'ok' if check['ok'] else 'FAIL'}] {check['check']}: {check['detail']}")
+    logging.info(f"REHEARSAL: report written to {path}")
+    return path
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Session Health Monitor
+Keep a prepared browser session alive and watch its latency until the sale.
+
+A background thread periodically measures three things:
+  - command round trip: one cheap chromedriver command (getCurrentUrl)
+  - script evaluation: in-page time for a small DOM workload
+  - navigation: a credentialed in-page fetch of a lightweight page
+
+The fetch also sends the session cookies, keeping the session warm, and every
+few samples the home page is fetched to confirm it is still logged in. Samples are kept in
+a rolling window; when the latest sample exceeds its threshold a local alert
+(log warning plus terminal bell) is raised.
+
+The monitor runs in a different process from the buy flow, so it cannot share
+a lock with it. Instead, flash_sale_purchase drops a lock file before it
+touches the browser, and the monitor skips samples while that file exists.
+A sample already in flight when the sale starts still finishes, which takes
+well under a second. Give the monitor an until time (the sale start) to stop
+sampling for good before then.
+"""
+
+import os
+import time
+import logging
+import threading
+import statistics
+from collections import deque
+
+
+SCRIPT_PROBE = """
+var start = performance.now();
+var count = document.querySelectorAll('a, input, button').length;
+return [performance.now() - start, count];
+"""
+
+# Async: time a credentialed fetch; when asked, also report whether the page shows a logged-in nav
+FETCH_PROBE = """
+var done = arguments[arguments.length - 1];
+var url = arguments[0], checkLogin = arguments[1];
+var start = performance.now();
+fetch(url, {credentials: 'include', cache: 'no-store'})
+    .then(function (response) { return checkLogin ? response.text() : null; })
+    .then(function (body) {
+        var elapsed = performance.now() - start;
+        if (body === null) { done([elapsed, null]); return; }
+        done([elapsed, body.indexOf('nav-link-accountList') !== -1 && body.indexOf('Hello, sign in') === -1]);
+    })
+    .catch(function (error) { done([null, String(error)]); });
+"""
+
+DEFAULT_THRESHOLDS_MS = {'rtt': 150, 'script': 250, 'navigation': 2000}
+
+
+def mark_sale_started(lock_dir):
+    """Create this run's lock file in lock_dir and return its path.
+
+    Monitors in other processes skip their samples while any fresh lock
+    exists, so they do not send commands to the browser during the buy flow.
+    """
+    os.makedirs(lock_dir, exist_ok=True)
+    path = os.path.join(lock_dir, f"{os.getpid()}-{threading.get_ident()}.lock")
+    with open(path, 'w') as f:
+        f.write(str(time.time()))
+    return path
+
+
+def clear_sale_mark(path):
+    """Remove a lock file created by mark_sale_started."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def sale_running(lock_dir, max_age):
+    """True when lock_dir holds a lock younger than max_age seconds."""
+    try:
+        names = os.listdir(lock_dir)
+    except OSError:
+        return False
+    now = time.time()
+    for name in names:
+        if not name.endswith('.lock'):
+            continue
+        try:
+            # A lock left behind by a killed run goes stale instead of pausing forever
+            if now - os.path.getmtime(os.path.join(lock_dir, name)) < max_age:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+class SessionMonitor:
+    def __init__(self, driver, base_url, interval=30, health_url='/robots.txt',
+                 thresholds_ms=None, window=20, login_check_every=10, on_sample=None,
+                 pause_dir=None, pause_max_age=900, until=None):
+        """Initialize the monitor for an already logged-in driver.
+
+        Sampling is skipped while a buy flow holds a lock in pause_dir (see
+        mark_sale_started), and stops for good at the epoch time until.
+        """
+        self.driver = driver
+        self.base_url = base_url
+        self.interval = interval
+        self.health_url = health_url if health_url.startswith('http') else base_url + health_url
+        self.thresholds_ms = dict(DEFAULT_THRESHOLDS_MS, **(thresholds_ms or {}))
+        self.login_check_every = login_check_every
+        self.on_sample = on_sample
+        self.samples = {name: deque(maxlen=window) for name in DEFAULT_THRESHOLDS_MS}
+        self.logged_in = None
+        self.tabs = None
+        self.alerts = []
+        self.sample_count = 0
+        self.pause_dir = pause_dir
+        self.pause_max_age = pause_max_age
+        self.until = until
+        self.paused = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-monitor", daemon=True)
+        self._thread.start()
+        logging.info(f"Session monitor started (every {self.interval}s)")
+
+    def stop(self):
+        """Stop sampling and wait for any in-flight sample to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 10)
+        logging.info("Session monitor stopped")
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.until and time.time() >= self.until:
+                logging.info("Session monitor reached sale time, no more samples")
+                return
+            if self.pause_dir and sale_running(self.pause_dir, self.pause_max_age):
+                if not self.paused:
+                    logging.info("Session monitor paused: a buy flow is using the browser")
+                self.paused = True
+            else:
+                if self.paused:
+                    logging.info("Session monitor resumed")
+                self.paused = False
+                try:
+                    self.sample()
+                except Exception as e:
+                    logging.warning(f"Session monitor sample failed: {e}")
+            wait = self.interval
+            if self.until:
+                wait = max(0, min(wait, self.until - time.time()))
+            self._stop.wait(wait)
+
+    def sample(self):
+        """Take one measurement of every metric and raise alerts if needed."""
+        self.sample_count += 1
+        check_login = self.sample_count == 1 or self.sample_count % self.login_check_every == 0
+
+        start = time.perf_counter()
+        self.driver.current_url
+        self._record('rtt', (time.perf_counter() - start) * 1000)
+
+        script_ms, _ = self.driver.execute_script(SCRIPT_PROBE)
+        self._record('script', script_ms)
+
+        navigation_ms, error = self.driver.execute_async_script(FETCH_PROBE, self.health_url, False)
+        if navigation_ms is None:
+            raise RuntimeError(f"Health fetch failed: {error}")
+        self._record('navigation', navigation_ms)
+
+        if check_login:
+            # The home page is heavier, so it is fetched only occasionally and not timed
+            _, login_state = self.driver.execute_async_script(FETCH_PROBE, self.base_url + '/', True)
+            self.logged_in = login_state is True
+            if not self.logged_in:
+                self._alert("Session appears to be logged out")
+
+        self.tabs = len(self.driver.window_handles)
+
+        report = self.report()
+        if self.on_sample:
+            self.on_sample(report)
+        return report
+
+    def _record(self, metric, value_ms):
+        self.samples[metric].append(value_ms)
+        threshold = self.thresholds_ms[metric]
+        if value_ms > threshold:
+            self._alert(f"{metric} latency {value_ms:.0f}ms above {threshold}ms threshold")
+
+    def _alert(self, message):
+        self.alerts.append((time.time(), message))
+        logging.warning(f"SESSION HEALTH: {message}")
+        print("\a", end="", flush=True)
+
+    def report(self):
+        """Summarise the rolling window: last, p50, p95 and jitter per metric."""
+        report = {'samples': self.sample_count, 'logged_in': self.logged_in, 'tabs': self.tabs,
+                  'alerts': len(self.alerts)}
+        for metric, values in self.samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            report[metric] = {
+                'last': round(values[-1], 1),
+                'p50': round(statistics.median(ordered), 1),
+                'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                'jitter': round(statistics.pstdev(ordered), 1),
+            }
+        return report
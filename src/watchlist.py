@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Multi-Target Watchlist Engine
+Buy several watchlist targets from one logged-in browser session.
+
+Each target gets its own tab. An asyncio event loop runs one coroutine per
+target; WebDriver commands are serialized through a priority-ordered driver
+lane, but page loads, sale-time waits and readiness polling happen outside the
+lane, so a search page loading in one tab overlaps with add-to-cart in another.
+
+That only holds when the session uses pageLoadStrategy "none": with the default
+"normal" strategy chromedriver waits for the pending navigation inside the
+command that started it, i.e. while the lane is held. Create the buyer with
+settings={'page_load_strategy': 'none'} (run_watchlist.py does).
+"""
+
+import re
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from datetime import datetime
+from urllib.parse import quote_plus
+
+
+# Product page state in one round trip: readiness, price and add-to-cart button.
+# Right after navigating, the previous page is still in the tab, so only a product
+# page (or the page that was navigated to) counts as ready.
+PRODUCT_STATE_SCRIPT = """
+var expected = new URL(arguments[0], location.href);
+function asin(url) { var m = url.pathname.match(/\\/(?:dp|gp\\/product)\\/([A-Z0-9]{10})/); return m ? m[1] : null; }
+var here = new URL(location.href);
+var arrived = asin(expected) ? asin(here) === asin(expected)
+                             : here.pathname + here.search === expected.pathname + expected.search;
+if (document.readyState === 'loading' || !(arrived || document.querySelector('#productTitle'))) { return null; }
+var priceSelectors = ['#corePrice_feature_div .a-offscreen', '#corePriceDisplay_desktop_feature_div .a-offscreen',
+                      '#priceblock_dealprice', '#priceblock_ourprice', '.a-price .a-offscreen'];
+var price = null;
+for (var i = 0; i < priceSelectors.length && price === null; i++) {
+    var el = document.querySelector(priceSelectors[i]);
+    if (el && el.textContent.trim()) { price = el.textContent.trim(); }
+}
+var title = document.querySelector('#productTitle');
+var button = document.querySelector('#add-to-cart-button, input[name="submit.add-to-cart"]');
+return {
+    title: title ? title.textContent.trim() : null,
+    price: price,
+    hasButton: !!(button && !button.disabled),
+    complete: document.readyState === 'complete'
+};
+"""
+
+# First organic search result link, or null while the search page for this query is still loading
+SEARCH_STATE_SCRIPT = """
+var expected = new URL(arguments[0], location.href);
+var here = new URL(location.href);
+if (document.readyState === 'loading' || here.pathname !== expected.pathname
+        || here.searchParams.get('k') !== expected.searchParams.get('k')) { return null; }
+var link = document.querySelector("[data-component-type='s-search-result'] h2 a, "
+                                  + "[data-component-type='s-search-result'] .a-link-normal");
+return link ? link.href : null;
+"""
+
+CLICK_ADD_TO_CART_SCRIPT = """
+var button = document.querySelector('#add-to-cart-button, input[name="submit.add-to-cart"]');
+if (!button) { return false; }
+button.click();
+return true;
+"""
+
+
+def parse_price(text):
+    """Parse a displayed price like '₹1,299.00' into a float."""
+    if not text:
+        return None
+    match = re.search(r'\d[\d,]*(?:\.\d+)?', text)
+    if not match:
+        return None
+    return float(match.group(0).replace(',', ''))
+
+
+def parse_sale_time(value):
+    """Parse a sale time ('HH:MM[:SS]' today or ISO datetime) into epoch seconds."""
+    if not value:
+        return time.time()
+    if re.fullmatch(r'\d{1,2}:\d{2}(:\d{2})?', value):
+        parts = [int(part) for part in value.split(':')] + [0]
+        sale = datetime.now().replace(hour=parts[0], minute=parts[1], second=parts[2], microsecond=0)
+        return sale.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_watchlist(config):
+    """Read and normalise watchlist targets from the config, highest priority first."""
+    default_max_price = config.get('purchase_limits', {}).get('max_price')
+    targets = []
+    for index, entry in enumerate(config.get('watchlist', [])):
+        if not entry.get('name') and not entry.get('asin'):
+            logging.warning(f"Skipping watchlist entry {index}: needs a name or asin")
+            continue
+        targets.append({
+            'id': index,
+            'name': entry.get('name') or entry['asin'],
+            'asin': entry.get('asin'),
+            'max_price': entry.get('max_price', default_max_price),
+            'priority': entry.get('priority', 0),
+            'sale_time': parse_sale_time(entry.get('sale_time')),
+            'timeout': entry.get('timeout', 30),
+        })
+    targets.sort(key=lambda target: -target['priority'])
+    return targets
+
+
+class _DriverLane:
+    """Async lock over the WebDriver that hands the driver to the highest-priority waiter."""
+
+    def __init__(self):
+        self._busy = False
+        self._waiters = []
+        self._order = itertools.count()
+
+    async def acquire(self, priority):
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._order), future))
+        await future
+
+    def release(self):
+        # Ownership passes straight to the next waiter, so _busy stays set
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.cancelled():
+                future.set_result(None)
+                return
+        self._busy = False
+
+
+class WatchlistEngine:
+    def __init__(self, buyer, targets, poll_interval=0.1):
+        """Initialize the engine with a logged-in buyer and normalised targets."""
+        self.buyer = buyer
+        self.driver = buyer.driver
+        self.base_url = buyer.base_url
+        self.targets = targets
+        self.poll_interval = poll_interval
+        self.tabs = {}
+        self.results = []
+        self._lane = _DriverLane()
+        self._active_tab = None
+        if self.driver.capabilities.get('pageLoadStrategy') != 'none':
+            logging.warning("WATCHLIST: pageLoadStrategy is not 'none'; tab page loads will not overlap")
+
+    def prepare(self):
+        """Open one tab per target in the current browser session."""
+        for target in self.targets:
+            # Keyed by watchlist position: two entries may share a name
+            self.tabs[target['id']] = self.buyer.open_tab()
+            self.driver.get(self.base_url)
+            logging.info(f"WATCHLIST: Tab ready for '{target['name']}'")
+        self._active_tab = self.driver.current_window_handle
+
+    def run(self):
+        """Run every target to completion and return per-target results."""
+        if not self.tabs:
+            self.prepare()
+        asyncio.run(self._run_all())
+        return self.results
+
+    async def _run_all(self):
+        await asyncio.gather(*(self._run_target(target) for target in self.targets))
+
+    async def _call(self, target, fn, *args):
+        """Run a blocking driver call in the target's tab while holding the lane."""
+        await self._lane.acquire(target['priority'])
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._in_tab, target, fn, args)
+        finally:
+            self._lane.release()
+
+    def _in_tab(self, target, fn, args):
+        handle = self.tabs[target['id']]
+        if self._active_tab != handle:
+            self.driver.switch_to.window(handle)
+            self._active_tab = handle
+        return fn(*args)
+
+    def _navigate(self, url):
+        # Assigning location returns immediately; the page loads while other tabs work
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+
+    async def _poll(self, target, script, deadline, *args):
+        """Poll an in-page script until it returns a truthy value or the deadline passes."""
+        while time.time() < deadline:
+            value = await self._call(target, self.driver.execute_script, script, *args)
+            if value:
+                return value
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    async def _run_target(self, target):
+        result = {'name': target['name'], 'status': 'error', 'price': None, 'timings': {}, 'detail': ''}
+        timings = result['timings']
+        self.results.append(result)
+
+        wait = target['sale_time'] - time.time()
+        if wait > 0:
+            logging.info(f"WATCHLIST: '{target['name']}' waiting {wait:.1f}s for sale time")
+            await asyncio.sleep(wait)
+
+        start_time = time.perf_counter()
+        deadline = time.time() + target['timeout']
+        try:
+            # Resolve the product page: straight to the ASIN, or via the first search result
+            if target['asin']:
+                product_url = f"{self.base_url}/dp/{target['asin']}"
+            else:
+                phase_start = time.perf_counter()
+                search_url = f"{self.base_url}/s?k={quote_plus(target['name'])}"
+                await self._call(target, self._navigate, search_url)
+                product_url = await self._poll(target, SEARCH_STATE_SCRIPT, deadline, search_url)
+                timings['search'] = time.perf_counter() - phase_start
+                if not product_url:
+                    result['status'] = 'not_found'
+                    result['detail'] = 'No search results before timeout'
+                    return
+
+            phase_start = time.perf_counter()
+            await self._call(target, self._navigate, product_url)
+            state = await self._poll(target, PRODUCT_STATE_SCRIPT, deadline, product_url)
+            timings['product_page'] = time.perf_counter() - phase_start
+            if not state:
+                result['status'] = 'timeout'
+                result['detail'] = 'Product page did not load before timeout'
+                return
+
+            result['price'] = parse_price(state.get('price'))
+            if target['max_price'] is not None and result['price'] is None:
+                # An unreadable price must never get past a configured cap
+                result['status'] = 'price_unknown'
+                result['detail'] = f"Could not read the price (limit {target['max_price']})"
+                return
+            if target['max_price'] is not None and result['price'] > target['max_price']:
+                result['status'] = 'over_price'
+                result['detail'] = f"Price {result['price']} above limit {target['max_price']}"
+                return
+
+            phase_start = time.perf_counter()
+            if state.get('hasButton'):
+                added = await self._call(target, self.driver.execute_script, CLICK_ADD_TO_CART_SCRIPT)
+            else:
+                # No direct buy box - fall back to the buyer's page routes and selector scan.
+                # Its variant and product navigations wait for the new ASIN, so a stale page is not analysed
+                added = await self._call(target, self.buyer.add_to_cart, True)
+            timings['add_to_cart'] = time.perf_counter() - phase_start
+
+            result['status'] = 'added' if added else 'not_found'
+            if not added:
+                result['detail'] = 'Add to Cart button not found'
+
+        except Exception as e:
+            result['detail'] = str(e)
+            logging.error(f"WATCHLIST: '{target['name']}' failed: {e}")
+
+        finally:
+            timings['total'] = time.perf_counter() - start_time
+            logging.info(f"WATCHLIST: '{target['name']}' -> {result['status']} in {timings['total']:.2f}s")
@@ -3,6 +3,27 @@
 # Start Chrome with remote debugging enabled
 # This allows the Amazon Auto Buyer to connect to an existing Chrome session
 # instead of opening a new browser window every time
+#
+# Usage: ./start_chrome_debug.sh [PORT] [PROFILE]
+# PROFILE is a managed profile name under browser_profiles/ (the same profiles
+# prime_cache.py fills) or a path to any Chrome user data directory.
+# Run several instances on different ports/profiles for parallel workers
+# (supervisor.py does this automatically via src/chrome_launcher.py).
+
+PORT=${1:-9222}
+if [ "$PORT" = "9222" ]; then
+    DEFAULT_PROFILE=default
+else
+    DEFAULT_PROFILE=port-$PORT
+fi
+PROFILE=${2:-$DEFAULT_PROFILE}
+case "$PROFILE" in
+    */*) USER_DATA_DIR=$PROFILE ;;
+    *) USER_DATA_DIR="$(cd "$(dirname "$0")" && pwd)/browser_profiles/$PROFILE" ;;
+esac
+# Keep the HTTP cache inside the profile and large enough that primed assets are not evicted
+CACHE_SIZE_MB=${CACHE_SIZE_MB:-512}
+mkdir -p "$USER_DATA_DIR"
 
 echo "Starting Chrome with remote debugging enabled..."
 echo "The Amazon Auto Buyer will be able to connect to this Chrome session."
@@ -12,8 +33,8 @@ echo "To close this Chrome session later, just close the browser normally."
 echo ""
 
 # Check if Chrome is already running on the debug port
-if lsof -Pi :9222 -sTCP:LISTEN -t >/dev/null ; then
-    echo "Chrome is already running with remote debugging on port 9222"
+if lsof -Pi :$PORT -sTCP:LISTEN -t >/dev/null ; then
+    echo "Chrome is already running with remote debugging on port $PORT"
     echo "You can use the existing session or close it first to start a new one."
     exit 0
 fi
@@ -21,14 +42,19 @@ fi
 # Start Chrome with remote debugging
 # Using Google Chrome on macOS
 /Applications/Google\ Chrome.app/Contents/MacOS/Google\ Chrome \
-    --remote-debugging-port=9222 \
-    --user-data-dir=/tmp/chrome-debug-session \
+    --remote-debugging-port=$PORT \
+    --user-data-dir="$USER_DATA_DIR" \
+    --disk-cache-dir="$USER_DATA_DIR/DiskCache" \
+    --disk-cache-size=$((CACHE_SIZE_MB * 1024 * 1024)) \
     --disable-web-security \
     --disable-features=VizDisplayCompositor \
     --new-window \
     "https://amazon.in" &
 
-echo "Chrome started with remote debugging on port 9222"
+echo "Chrome started with remote debugging on port $PORT (profile: $USER_DATA_DIR)"
+if [ "$PORT" != "9222" ]; then
+    echo "Set \"debugger_address\": \"127.0.0.1:$PORT\" in config/config.json to use it"
+fi
 echo "Amazon.in should open automatically"
 echo "You can now run the Amazon Auto Buyer script"
 echo ""
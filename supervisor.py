@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Multi-Worker Supervisor
+Buy several different items in the same sale window with one browser per worker.
+
+Usage:
+    python supervisor.py "item one" "item two" --workers 2
+    python supervisor.py            # uses the names in the config watchlist
+"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from buyer_pool import BuyerSupervisor
+
+
+def main():
+    """Launch buyer workers for each target and print their results."""
+    parser = argparse.ArgumentParser(description="Run independent buyer workers in parallel")
+    parser.add_argument('targets', nargs='*', help="Product names (default: config watchlist names)")
+    parser.add_argument('--workers', type=int, help="Number of worker processes (default: one per target)")
+    parser.add_argument('--config', default='config/config.json')
+    parser.add_argument('--profile-root', default='/tmp/amazon-buyer-workers',
+                        help="Directory holding one Chrome --user-data-dir per worker")
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    targets = args.targets
+    if not targets:
+        try:
+            with open(args.config, 'r') as f:
+                targets = [entry.get('name') for entry in json.load(f).get('watchlist', []) if entry.get('name')]
+        except FileNotFoundError:
+            targets = []
+    if not targets:
+        print("❌ No targets given and no watchlist names in config. Exiting...")
+        return
+
+    print("🧑‍🤝‍🧑 SUPERVISOR MODE")
+    print("=" * 50)
+    settings = {'headless': True} if args.headless else {}
+    supervisor = BuyerSupervisor(targets, args.workers, args.config, args.profile_root, settings)
+    print(f"🚀 {len(targets)} targets across {supervisor.workers} workers...")
+    report = supervisor.run()
+
+    print("-" * 50)
+    for worker_id, worker in sorted(report['workers'].items()):
+        print(f"⚙️  worker {worker_id}: port {worker['port']}, ready in {worker['startup']:.2f}s")
+    for result in report['results']:
+        icon = "✅" if result['success'] else "❌"
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result['phases'].items())
+        print(f"{icon} {result['target']} (worker {result['worker']}): {result['elapsed']:.2f}s [{phases}]")
+    for error in report['errors']:
+        print(f"❌ worker {error['worker']}: {error['error']}")
+    print(f"⏱️  Total: {report['elapsed']:.2f}s")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()